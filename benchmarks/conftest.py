@@ -0,0 +1,166 @@
+import io
+import multiprocessing
+import pathlib
+import resource
+import zlib
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from PIL import Image
+
+PAGE_SIZE = (362.835, 272.126)
+"""The size in points of a 4:3 beamer page."""
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-pages", default="10,100,1000",
+                     help="The comma separated page counts of the synthetic "
+                     "decks (default: %(default)s)")
+
+
+def pytest_generate_tests(metafunc):
+    if "pages" in metafunc.fixturenames:
+        pages = metafunc.config.getoption("--bench-pages")
+        metafunc.parametrize("pages", [int(_) for _ in pages.split(",")],
+                             scope="session")
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _image(page):
+    """Create a smooth 640x480 image that differs on every page"""
+    gradient = Image.linear_gradient("L").resize((640, 480))
+    shift = Image.eval(gradient, lambda _: (_ + 7 * page) % 256)
+    image = Image.merge("RGB", (gradient, shift,
+                                gradient.transpose(Image.FLIP_LEFT_RIGHT)))
+    return image.tobytes()
+
+
+def write_pdf(path, pages, kind="text", title="A Synthetic Deck",
+              author="A. Nonymous"):
+    """Write a PDF of ``pages`` frames without any external tools
+
+    Each page has a frame title and a few lines of text.  The pages of an
+    'image' deck also show a full page image unique to the page.
+
+    """
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    tree = add(None)
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    info = add(f"<< /Title ({_escape(title)}) /Author ({_escape(author)}) "
+               ">>".encode())
+    kids = []
+    width, height = PAGE_SIZE
+    for page in range(1, pages + 1):
+        lines = [f"Item {_} of frame {page}" for _ in range(1, 6)]
+        content = [f"BT /F1 20 Tf 20 {height - 40:.3f} Td "
+                   f"(Frame {page}) Tj ET",
+                   "BT /F1 12 Tf 20 180 Td 16 TL",
+                   *[f"({_escape(_)}) '" for _ in lines],
+                   "ET"]
+        resources = f"/Font << /F1 {font} 0 R >>"
+        if kind == "image":
+            data = zlib.compress(_image(page), 1)
+            image = add(b"<< /Type /XObject /Subtype /Image /Width 640 "
+                        b"/Height 480 /ColorSpace /DeviceRGB "
+                        b"/BitsPerComponent 8 /Filter /FlateDecode "
+                        b"/Length " + str(len(data)).encode() + b" >>\n"
+                        b"stream\n" + data + b"\nendstream")
+            content.insert(0, f"q {width:.3f} 0 0 {height:.3f} 0 0 cm "
+                           "/Im1 Do Q")
+            resources += f" /XObject << /Im1 {image} 0 R >>"
+
+        stream = "\n".join(content).encode()
+        contents = add(b"<< /Length " + str(len(stream)).encode() + b" >>\n"
+                       b"stream\n" + stream + b"\nendstream")
+        kids.append(add(f"<< /Type /Page /Parent {tree} 0 R "
+                        f"/MediaBox [0 0 {width} {height}] "
+                        f"/Resources << {resources} >> "
+                        f"/Contents {contents} 0 R >>".encode()))
+
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {tree} 0 R >>".encode()
+    objects[tree - 1] = (f"<< /Type /Pages /Count {len(kids)} /Kids ["
+                         + " ".join(f"{_} 0 R" for _ in kids)
+                         + "] >>").encode()
+
+    buffer = io.BytesIO()
+    buffer.write(b"%PDF-1.5\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(buffer.tell())
+        buffer.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    xref = buffer.tell()
+    buffer.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+                 .encode())
+    for offset in offsets:
+        buffer.write(f"{offset:010d} 00000 n \n".encode())
+
+    buffer.write(f"trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R "
+                 f"/Info {info} 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+                 .encode())
+    pathlib.Path(path).write_bytes(buffer.getvalue())
+
+
+@pytest.fixture(scope="session")
+def deck_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("decks")
+
+
+@pytest.fixture(scope="session", params=["text", "image"])
+def kind(request):
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def deck(deck_dir, pages, kind):
+    """The slides and notes PDFs of a synthetic deck"""
+    slides = deck_dir.joinpath(f"slides-{kind}-{pages}.pdf")
+    notes = deck_dir.joinpath(f"notes-{pages}.pdf")
+    if not slides.exists():
+        write_pdf(slides, pages, kind)
+
+    if not notes.exists():
+        write_pdf(notes, pages)
+
+    return slides, notes
+
+
+def _peak_rss(function, args, kwargs):
+    """Call the function and get the peak RSS of the process and children"""
+    function(*args, **kwargs)
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+
+@pytest.fixture
+def record(benchmark):
+    """Record the peak memory and output size with the timings
+
+    The stage is called once more in a process forked from a fresh
+    interpreter so the peak resident set sizes are those of this stage
+    alone rather than the maxima over the life of the test session.
+
+    """
+    def _record(function, *args, output_bytes=None, **kwargs):
+        context = multiprocessing.get_context("forkserver")
+        with ProcessPoolExecutor(1, mp_context=context) as pool:
+            rss, children = pool.submit(_peak_rss, function, args,
+                                        kwargs).result()
+
+        benchmark.extra_info["max_rss_kib"] = rss
+        benchmark.extra_info["children_max_rss_kib"] = children
+        if output_bytes is not None:
+            benchmark.extra_info["output_bytes"] = output_bytes
+
+    return _record
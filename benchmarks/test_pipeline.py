@@ -0,0 +1,113 @@
+"""Benchmarks of each stage of the conversion
+
+The peak resident set sizes recorded with each benchmark are measured
+by calling the stage once more in a process forked from a fresh
+interpreter so they include the imported modules but no other stage.
+"""
+import os
+import pathlib
+import shutil
+
+import pytest
+
+import beamer2pptx
+
+DPI = 96
+"""The resolution used by the stages not comparing resolutions."""
+
+
+class Prerendered(beamer2pptx.Backend):
+    """A backend serving the stages done before the benchmark
+
+    The document information, the notes, and the images are prepared
+    up front so only the presentation is built while timing.  The
+    images are linked into place as they are rendered.
+
+    """
+
+    name = "prerendered"
+
+    def __init__(self, info, notes, images):
+        self.info = info
+        self.text = notes
+        self.images = images
+
+    def probe(self, path, timeout=None):
+        return self.info
+
+    def notes(self, path, timeout=None, first=None, last=None,
+              layout=False):
+        return iter(self.text[(first or 1) - 1:last])
+
+    def render(self, path, output, first=None, last=None, *args, **kwargs):
+        for image in self.images[(first or 1) - 1:last]:
+            os.link(image, output.parent.joinpath(image.name))
+
+
+def _save(slides, notes, output):
+    """Convert the deck and save it as the benchmark of the save does"""
+    beamer2pptx.convert(slides, notes, jobs=0, dpi=DPI).save(output)
+
+
+def test_probe(benchmark, record, deck):
+    slides, _ = deck
+    info = benchmark(beamer2pptx.probe_pdf, slides)
+    record(beamer2pptx.probe_pdf, slides)
+    assert info.pages == len(info.page_sizes)
+
+
+def test_notes(benchmark, record, deck):
+    _, notes = deck
+    text = benchmark(beamer2pptx.extract_notes, notes)
+    record(beamer2pptx.extract_notes, notes,
+           output_bytes=sum(len(_.encode()) for _ in text))
+
+
+@pytest.mark.parametrize("jobs", [1, 0])
+@pytest.mark.parametrize("image_format", ["png", "jpeg"])
+@pytest.mark.parametrize("dpi", [DPI, 300])
+def test_rasterize(benchmark, record, deck, tmp_path, dpi, image_format,
+                   jobs):
+    slides, _ = deck
+    output = tmp_path.joinpath("images")
+    kwargs = {"jobs": jobs, "dpi": dpi, "image_format": image_format}
+
+    def setup():
+        shutil.rmtree(output, ignore_errors=True)
+        output.mkdir()
+
+    images = benchmark.pedantic(beamer2pptx.extract_slides,
+                                args=(slides, str(output)),
+                                kwargs=kwargs,
+                                setup=setup,
+                                rounds=3,
+                                )
+    output_bytes = sum(os.path.getsize(_) for _ in images)
+    setup()
+    record(beamer2pptx.extract_slides, slides, str(output),
+           output_bytes=output_bytes, **kwargs)
+
+
+def test_assemble(benchmark, record, deck, tmp_path):
+    slides, notes = deck
+    images = [pathlib.Path(_) for _ in
+              beamer2pptx.extract_slides(slides, tmp_path, jobs=0, dpi=DPI)]
+    backend = Prerendered(beamer2pptx.probe_pdf(slides),
+                          beamer2pptx.extract_notes(notes), images)
+    notes_map = list(range(len(images)))
+    pres = benchmark.pedantic(beamer2pptx.convert,
+                              args=(slides, notes, notes_map),
+                              kwargs={"backend": backend},
+                              rounds=3,
+                              )
+    record(beamer2pptx.convert, slides, notes, notes_map, backend=backend)
+    assert len(pres.slides) == len(images)
+
+
+def test_save(benchmark, record, deck, tmp_path):
+    slides, notes = deck
+    pres = beamer2pptx.convert(slides, notes, jobs=0, dpi=DPI)
+    output = tmp_path.joinpath("output.pptx")
+    benchmark.pedantic(pres.save, args=(str(output),), rounds=3)
+    output_bytes = pathlib.Path(output).stat().st_size
+    record(_save, slides, notes, str(output), output_bytes=output_bytes)
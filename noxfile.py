@@ -76,6 +76,20 @@ def test(session):
     session.run("pytest", *tests)
 
 
+@nox.session(venv_backend="conda")
+def benchmark(session):
+    """Run the benchmarks of the conversion stages
+
+    The synthetic decks have 10, 100, and 1000 pages unless other page
+    counts are given with ``--bench-pages``.  Alternate flags can be
+    passed to ``pytest`` using the positional arguments, for example
+    ``--benchmark-json`` to save the results for comparison.
+    """
+    session.install("pytest", "pytest-benchmark")
+    setup_environment(session)
+    session.run("pytest", "benchmarks", *session.posargs)
+
+
 @nox.session
 def docs(session):
     """Build the documentation"""
@@ -5,21 +5,66 @@ beamer2pptx
 Utilities for converting a beamer presentation into PowerPoint.
 """
 
+import asyncio
+import bisect
+import collections
+import contextlib
+import fractions
+import functools
+import hashlib
+import io
+import json
 import logging
+import math
+import mimetypes
 import os
 import pathlib
 import re
+import shutil
 import subprocess
 import tempfile
+import threading
+import time
+import weakref
 
 import pptx
 
+from PIL import Image
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from lxml import etree
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.enum.text import MSO_AUTO_SIZE
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import Part
+from pptx.opc.packuri import PackURI
+from pptx.oxml.ns import qn
+from pptx.parts.image import Image as PptxImage, ImagePart
+from pptx.shapes.picture import Picture
+from pptx.slide import Slide
+from pptx.util import Emu, Pt
+
 from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    ContextManager,
+    Deque,
+    Dict,
+    IO,
+    Iterable,
+    Iterator,
     List,
+    NamedTuple,
     Optional,
+    OrderedDict,
     Sequence,
     Tuple,
+    Type,
     Union,
+    cast,
 )
 from os import PathLike
 
@@ -34,139 +79,393 @@ ASPECT_RATIOS = {
              pptx.util.Emu(6858000)
              )
 }
-"""The known valid aspect ratios."""
+"""The preset slide sizes of the aspect ratios PowerPoint names."""
 
+_MAX_SLIDE_SIZE = 51206400
+"""The largest slide width or height in EMUs PowerPoint allows."""
 
-def extract_aspect_ratio(path: Union[PathLike, str],
-                         timeout: Optional[float] = None,
-                         ) -> str:
-    """Extract the aspect ratio from the PDF.
+IMAGE_FORMATS = ("png", "jpeg", "auto")
+"""The supported slide image formats."""
 
-    Parameters
-    ----------
+MODES = ("raster", "vector")
+"""The ways the slides can be embedded in the presentation."""
 
-    path: path-like
-        The path to the slides PDF.
-    timeout: float, optional
-        The timeout to pass to :func:`subprocess.run`.
+OVERLAYS = ("builds", "last")
+"""The ways the overlays of a frame can be converted."""
 
-    Returns
-    -------
+DISPLAYS = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+    "print": (3300, 2550),
+}
+"""The named target displays and their width and height in pixels.
 
-    str:
-        The aspect ratio of the presentation in the format 'w:h'.
+The 'print' display is a landscape US Letter page at 300 DPI.
+"""
 
-    Raises
-    ------
+_FALLBACK_DPI = 96
+"""The resolution of the images shown in place of vector slides."""
 
-    subprocess.TimeoutError:
-        If the call to :manpage:`pdfinfo` times out.
-    subprocess.CalledProcessError:
-        If the call to :manpage:`pdfinfo` raises an error.
-    RuntimeError:
-        If the aspect ratio cannot be deduced.
+_FINGERPRINT_DOCUMENTS = 16
+"""The number of documents whose fingerprints a cache remembers."""
 
-    Notes
-    -----
+_CHUNK_PAGES = 8
+"""The number of pages :func:`iter_slides` renders per process by default."""
 
-    This calls :manpage:`pdfinfo` to get the page size and compute the
-    aspect ratio.  It checks against the known possibilities rounded to
-    five significant figures and returns the most appropriate one.
+_TEXT_NAME = "beamer2pptx text"
+"""The name of the text boxes laid over the slide images."""
+
+_LINK_NAME = "beamer2pptx link"
+"""The name of the shapes holding the links of the slide images."""
+
+_MEDIA_NAME = "beamer2pptx media"
+"""The name of the movies played on the slide images."""
+
+_LINE_HEIGHT = 1.2
+"""The ratio of the height of a line of text to its font size."""
+
+_R_NAMESPACE = \
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_SVG_NAMESPACE = "http://schemas.microsoft.com/office/drawing/2016/SVG/main"
+_SVG_EXTENSION = "{96DAC541-7B7A-43D3-8B79-37D633B846F1}"
+_XHTML = "http://www.w3.org/1999/xhtml"
+
+
+class PdfInfo(NamedTuple):
+    """The document information reported by :manpage:`pdfinfo`.
+
+    Instances are created by :func:`probe_pdf` and can be passed in
+    place of the path to :func:`extract_aspect_ratio`,
+    :func:`extract_metadata`, and :func:`extract_page_count` to avoid
+    calling :manpage:`pdfinfo` more than once for the same file.
 
     """
-    proc = subprocess.run(["pdfinfo", str(path)],
-                          capture_output=True,
-                          timeout=timeout,
-                          text=True,
-                          )
 
-    logger = logging.getLogger(__name__ + ".extract_aspect_ratio")
-    try:
-        proc.check_returncode()
-    except Exception:
-        logger.error(f"Error message: '{proc.stderr}'")
-        raise
+    title: str
+    """The title of the document."""
+    subject: str
+    """The subject of the document."""
+    keywords: str
+    """The keywords of the document."""
+    author: str
+    """The author of the document."""
+    pages: int
+    """The number of pages in the document."""
+    page_sizes: List[Tuple[float, float]]
+    """The width and height in points of each page."""
 
-    if proc.stdout == "":
-        raise RuntimeError(f"'{logger.name}' no output from pdfinfo")
 
-    match = re.search(r"Page\s*size:\s*([\d.]+)\s*.\s*([\d.]+)",
-                      proc.stdout,
-                      re.MULTILINE
-                      )
-    if not match:
-        raise RuntimeError(
-            f"'{logger.name}' could not locate page size"
-        )
+class Word(NamedTuple):
+    """A word on a page and its bounding box.
 
-    ratio = float(match.group(1)) / float(match.group(2))
-    for key, (width, height) in ASPECT_RATIOS.items():
-        value = width / height
-        if round(value, ndigits=4) == round(ratio, ndigits=4):
-            return key
+    The coordinates are in points from the top left corner of the page
+    like the ``-bbox`` output of :manpage:`pdftotext`.
 
-    raise RuntimeError(
-        f"'{logger.name}' could not deduce aspect ratio for {ratio}"
-    )
+    """
 
+    text: str
+    """The text of the word."""
+    x_min: float
+    """The left edge of the word."""
+    y_min: float
+    """The top edge of the word."""
+    x_max: float
+    """The right edge of the word."""
+    y_max: float
+    """The bottom edge of the word."""
 
-def extract_metadata(path: Union[PathLike, str],
-                     timeout: Optional[float] = None,
-                     ) -> Tuple[str, str, str, str]:
-    """Extract the metadata from the PDF.
 
-    Parameters
-    ----------
+class Link(NamedTuple):
+    """A link on a page and the area in which it can be clicked.
 
-    path: path-like
-        The path to the slides PDF.
-    timeout: float, optional
-        The timeout to pass to :func:`subprocess.run`.
+    The coordinates are in points from the top left corner of the page
+    like those of a :class:`Word`.
 
-    Returns
-    -------
+    """
 
-    str:
-        The title of the presentation.
-    str:
-        The subject of the presentation.
-    str:
-        The keywords in the presentation.
-    str:
-        The author of the presentation.
+    target: Union[int, str]
+    """The page (zero based) or the URI to which the link goes."""
+    x_min: float
+    """The left edge of the link."""
+    y_min: float
+    """The top edge of the link."""
+    x_max: float
+    """The right edge of the link."""
+    y_max: float
+    """The bottom edge of the link."""
 
-    Raises
-    ------
 
-    subprocess.TimeoutError:
-        If the call to :manpage:`pdfinfo` times out.
-    subprocess.CalledProcessError:
-        If the call to :manpage:`pdfinfo` raises an error.
+class Media(NamedTuple):
+    """A media file played on a page and the area in which it plays.
+
+    The coordinates are in points from the top left corner of the page
+    like those of a :class:`Word`.
+
+    """
+
+    path: str
+    """The path to the media file."""
+    x_min: float
+    """The left edge of the media."""
+    y_min: float
+    """The top edge of the media."""
+    x_max: float
+    """The right edge of the media."""
+    y_max: float
+    """The bottom edge of the media."""
+
+
+class Event(NamedTuple):
+    """A timed stage of a conversion.
+
+    Events are passed to the ``on_event`` callback of :func:`convert`
+    and :func:`extract_slides` when each stage ends.  The stages are
+    'convert', 'probe', 'notes', 'infer_notes_map', 'fingerprints',
+    'render', and 'insert'.  There is a 'render' event for each page
+    timed from the image written by the backend and an 'insert' event
+    for each slide.
+
+    """
+
+    name: str
+    """The name of the stage."""
+    start: float
+    """The time the stage started in seconds since the epoch."""
+    end: float
+    """The time the stage ended in seconds since the epoch."""
+    thread: int
+    """The identifier of the thread running the stage."""
+    args: Dict[str, Any]
+    """The details of the stage such as the pages or bytes written."""
 
-    Notes
-    -----
 
-    This calls :manpage:`pdfinfo` to extract the metadata.
+class Trace:
+    """A collector of :class:`Event` instances.
+
+    An instance can be passed as the ``on_event`` callback of several
+    conversions, even concurrent ones, and the collected events written
+    in the Chrome trace format for :program:`chrome://tracing` or
+    Perfetto.
 
     """
-    proc = subprocess.run(["pdfinfo", str(path)],
-                          capture_output=True,
-                          timeout=timeout,
-                          text=True,
-                          )
 
-    logger = logging.getLogger(__name__ + ".extract_metadata")
+    def __init__(self) -> None:
+        self.events: List[Event] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def summary(self) -> Dict[str, Tuple[int, float]]:
+        """Count the events and total the seconds spent in each stage"""
+        totals: Dict[str, Tuple[int, float]] = {}
+        for event in self.events:
+            count, seconds = totals.get(event.name, (0, 0.0))
+            totals[event.name] = (count + 1,
+                                  seconds + event.end - event.start)
+
+        return totals
+
+    def write(self, path: Union[PathLike, str]) -> None:
+        """Write the events as a Chrome trace JSON file"""
+        pid = os.getpid()
+        events = [{"name": _.name,
+                   "cat": __name__,
+                   "ph": "X",
+                   "ts": round(_.start * 1e6),
+                   "dur": round((_.end - _.start) * 1e6),
+                   "pid": pid,
+                   "tid": _.thread,
+                   "args": {key: str(value) if isinstance(value, PathLike)
+                            else value for key, value in _.args.items()},
+                   } for _ in self.events]
+        with open(path, "w") as stream:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"},
+                      stream)
+
+
+def _emit(on_event: Optional[Callable[[Event], None]],
+          name: str,
+          start: float,
+          **args: Any,
+          ) -> None:
+    """Report a stage that started at ``start`` and ends now"""
+    _emit_at(on_event, name, start, time.time(), **args)
+
+
+def _emit_at(on_event: Optional[Callable[[Event], None]],
+             name: str,
+             start: float,
+             end: float,
+             **args: Any,
+             ) -> None:
+    """Report a stage that started at ``start`` and ended at ``end``"""
+    if on_event is not None:
+        on_event(Event(name, start, end, threading.get_ident(), args))
+
+
+@contextlib.contextmanager
+def _span(on_event: Optional[Callable[[Event], None]],
+          name: str,
+          **args: Any,
+          ) -> Iterator[Dict[str, Any]]:
+    """Time a stage yielding the details to fill in"""
+    start = time.time()
     try:
-        proc.check_returncode()
-    except Exception:
-        logger.error(f"Error message: '{proc.stderr}'")
-        raise
+        yield args
+    finally:
+        _emit(on_event, name, start, **args)
+
+
+_LAST_PAGE = 2 ** 31 - 1
+"""A last page that :manpage:`pdfinfo` clamps to the page count."""
+
+
+class Backend:
+    """The interface to the tools reading and rendering a PDF.
+
+    The extractors delegate the work to a backend so the Poppler tools
+    can be replaced.  Subclasses implement :meth:`probe`, :meth:`notes`,
+    and :meth:`render` and can be added to :data:`BACKENDS` to select
+    them by name.  A backend is a context manager calling :meth:`close`
+    on exit to release any parsed documents it holds.
+
+    """
+
+    name = ""
+    """The name of the backend included in the cache keys."""
+
+    def probe(self,
+              path: Union[PathLike, str],
+              timeout: Optional[float] = None,
+              ) -> PdfInfo:
+        """Probe the document information (see :func:`probe_pdf`)"""
+        raise NotImplementedError
+
+    def notes(self,
+              path: Union[PathLike, str],
+              timeout: Optional[float] = None,
+              first: Optional[int] = None,
+              last: Optional[int] = None,
+              layout: bool = False,
+              ) -> Iterator[str]:
+        """Extract the text of each page (see :func:`iter_notes`)"""
+        raise NotImplementedError
+
+    def words(self,
+              path: Union[PathLike, str],
+              timeout: Optional[float] = None,
+              first: Optional[int] = None,
+              last: Optional[int] = None,
+              ) -> Iterator[List[Word]]:
+        """Extract the words of each page (see :func:`iter_words`)"""
+        raise NotImplementedError
+
+    def render(self,
+               path: Union[PathLike, str],
+               output: pathlib.Path,
+               first: Optional[int] = None,
+               last: Optional[int] = None,
+               dpi: float = 600,
+               image_format: str = "png",
+               quality: int = 90,
+               width: Optional[int] = None,
+               timeout: Optional[float] = None,
+               height: Optional[int] = None,
+               ) -> None:
+        """Render a range of pages to images
+
+        The images are named like :manpage:`pdftocairo` names them from
+        the root ``output`` except for the 'svg' format where ``output``
+        is the name of the single page rendered.  When ``width`` is
+        given, the images are scaled to it and to ``height`` if given.
+
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release the resources held by the backend"""
+
+    def __enter__(self) -> "Backend":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def _page_options(first: Optional[int] = None,
+                  last: Optional[int] = None,
+                  ) -> List[str]:
+    """Build the page range options of the Poppler tools"""
+    options = []
+    if first is not None:
+        options.extend(["-f", str(first)])
+
+    if last is not None:
+        options.extend(["-l", str(last)])
+
+    return options
+
+
+@contextlib.contextmanager
+def _stream(command: Sequence[str],
+            timeout: Optional[float],
+            logger: logging.Logger,
+            text: bool = True,
+            ) -> Iterator[IO]:
+    """Run a command and read its output from the pipe
+
+    The process is killed when ``timeout`` expires or the output is not
+    read to the end.  The errors are raised like :func:`subprocess.run`
+    with ``check=True`` would raise them.
+
+    """
+    expired = threading.Event()
+    with tempfile.TemporaryFile("w+") as stderr:
+        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr,
+                              text=text) as proc:
+            def expire() -> None:
+                expired.set()
+                proc.kill()
+
+            timer = None if timeout is None \
+                else threading.Timer(timeout, expire)
+            if timer is not None:
+                timer.start()
+
+            try:
+                yield cast(IO, proc.stdout)
+            except BaseException:
+                proc.kill()
+                raise
+            finally:
+                if timer is not None:
+                    timer.cancel()
+
+        if expired.is_set():
+            raise subprocess.TimeoutExpired(command, cast(float, timeout))
+
+        if proc.returncode != 0:
+            stderr.seek(0)
+            logger.error(f"Error message: '{stderr.read()}'")
+            raise subprocess.CalledProcessError(proc.returncode, command)
+
+
+def _parse_pdfinfo(output: str, logger: logging.Logger) -> PdfInfo:
+    """Parse the document information printed by :manpage:`pdfinfo`"""
+    if output == "":
+        raise RuntimeError(f"'{logger.name}' no output from pdfinfo")
 
     title = ""
     subject = ""
     keywords = ""
     author = ""
-    for line in proc.stdout.splitlines():
+    pages = 0
+    page_sizes = []
+    for line in output.splitlines():
         match = re.match(r"Title:\s*(.*)", line, re.IGNORECASE)
         if match:
             title = match.group(1)
@@ -187,207 +486,3519 @@ def extract_metadata(path: Union[PathLike, str],
             author = match.group(1)
             continue
 
-    return title, subject, keywords, author
+        match = re.match(r"Pages:\s*(\d+)", line, re.IGNORECASE)
+        if match:
+            pages = int(match.group(1))
+            continue
 
+        match = re.match(
+            r"Page\s*(?:\d+\s*)?size:\s*([\d.]+)\s*.\s*([\d.]+)",
+            line,
+            re.IGNORECASE
+        )
+        if match:
+            page_sizes.append((float(match.group(1)),
+                               float(match.group(2))
+                               ))
+            continue
 
-def extract_notes(path: Union[PathLike, str],
-                  timeout: Optional[float] = None,
-                  ) -> List[str]:
-    """Extract the notes from the PDF.
+    return PdfInfo(title, subject, keywords, author, pages, page_sizes)
+
+
+def _parse_words(stream: IO[bytes]) -> Iterator[List[Word]]:
+    """Parse the words of each page from the output of pdftotext -bbox"""
+    for _, element in etree.iterparse(stream,
+                                      tag=f"{{{_XHTML}}}page",
+                                      resolve_entities=False,
+                                      no_network=True):
+        yield [Word(_.text or "", float(_.get("xMin")),
+                    float(_.get("yMin")), float(_.get("xMax")),
+                    float(_.get("yMax")))
+               for _ in element.iterfind(f"{{{_XHTML}}}word")]
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+class PopplerBackend(Backend):
+    """The backend calling the Poppler command line tools.
+
+    Each call runs :manpage:`pdfinfo`, :manpage:`pdftotext`, or
+    :manpage:`pdftocairo` in a subprocess and parses its output.
+
+    """
+
+    name = "poppler"
+
+    def _run(self,
+             command: Sequence[str],
+             timeout: Optional[float],
+             logger: logging.Logger,
+             ) -> str:
+        """Run a tool to completion and get its output"""
+        proc = subprocess.run(command,
+                              capture_output=True,
+                              timeout=timeout,
+                              text=True,
+                              )
+        try:
+            proc.check_returncode()
+        except Exception:
+            logger.error(f"Error message: '{proc.stderr}'")
+            raise
+
+        return proc.stdout
+
+    def _open(self,
+              command: Sequence[str],
+              timeout: Optional[float],
+              logger: logging.Logger,
+              text: bool = True,
+              ) -> ContextManager[IO]:
+        """Run a tool streaming its output (see :func:`_stream`)"""
+        return _stream(command, timeout, logger, text=text)
+
+    def probe(self,
+              path: Union[PathLike, str],
+              timeout: Optional[float] = None,
+              ) -> PdfInfo:
+        """Probe the document information using :manpage:`pdfinfo`
+
+        This calls :manpage:`pdfinfo` once with ``-f 1 -l N`` so the size
+        of every page is reported along with the metadata.
+
+        """
+        logger = logging.getLogger(__name__ + ".probe_pdf")
+        output = self._run(["pdfinfo", "-f", "1", "-l", str(_LAST_PAGE),
+                            str(path)
+                            ],
+                           timeout,
+                           logger,
+                           )
+        return _parse_pdfinfo(output, logger)
+
+    def notes(self,
+              path: Union[PathLike, str],
+              timeout: Optional[float] = None,
+              first: Optional[int] = None,
+              last: Optional[int] = None,
+              layout: bool = False,
+              ) -> Iterator[str]:
+        """Stream the text of each page from :manpage:`pdftotext`
+
+        The output is read from the pipe and split at the formfeeds
+        ending each page so only one page is held at a time.
+
+        """
+        options = ["-layout"] if layout else []
+        logger = logging.getLogger(__name__ + ".extract_notes")
+        with self._open(["pdftotext", *options,
+                         *_page_options(first, last), str(path), "-"
+                         ],
+                        timeout,
+                        logger,
+                        ) as stdout:
+            page: List[str] = []
+            for chunk in iter(lambda: stdout.read(2 ** 16), ""):
+                *ended, rest = chunk.split("\f")
+                for text in ended:
+                    page.append(text)
+                    yield "".join(page)
+                    page = []
+
+                page.append(rest)
+
+    def words(self,
+              path: Union[PathLike, str],
+              timeout: Optional[float] = None,
+              first: Optional[int] = None,
+              last: Optional[int] = None,
+              ) -> Iterator[List[Word]]:
+        """Stream the words of each page from :manpage:`pdftotext`
+
+        The XHTML written with ``-bbox`` is parsed incrementally from
+        the pipe and each page is discarded once its words are read.
+
+        """
+        logger = logging.getLogger(__name__ + ".iter_words")
+        with self._open(["pdftotext", "-bbox", *_page_options(first, last),
+                         str(path), "-"
+                         ],
+                        timeout,
+                        logger,
+                        text=False,
+                        ) as stdout:
+            yield from _parse_words(stdout)
+
+    def render(self,
+               path: Union[PathLike, str],
+               output: pathlib.Path,
+               first: Optional[int] = None,
+               last: Optional[int] = None,
+               dpi: float = 600,
+               image_format: str = "png",
+               quality: int = 90,
+               width: Optional[int] = None,
+               timeout: Optional[float] = None,
+               height: Optional[int] = None,
+               ) -> None:
+        """Render a range of pages using :manpage:`pdftocairo`"""
+        options = _render_options(dpi, image_format, quality, width, height)
+        logger = logging.getLogger(__name__ + ".extract_slides")
+        stdout = self._run(["pdftocairo", *options,
+                            *_page_options(first, last),
+                            str(path), str(output)
+                            ],
+                           timeout,
+                           logger,
+                           )
+        if stdout != "":
+            logger.info(stdout)
+
+
+class PdfiumBackend(Backend):
+    """The backend using PDFium in process through :mod:`pypdfium2`.
+
+    Each document is parsed once and shared by every call until the
+    file changes or the backend is closed.  This avoids starting a
+    process and parsing its output for each call.
+
+    Raises
+    ------
+
+    ImportError:
+        If :mod:`pypdfium2` is not installed.
+
+    Notes
+    -----
+
+    PDFium is not thread safe so the pages are rendered one at a time
+    and only the encoding of the images runs concurrently.  The 'svg'
+    image format is not supported.
+
+    """
+
+    name = "pdfium"
+
+    def __init__(self) -> None:
+        self._documents: Dict[Tuple[str, int, int], Any] = {}
+        self._lock = threading.Lock()
+
+    def _document(self, path: Union[PathLike, str]) -> Any:
+        """Get the parsed document opening it if the file changed
+
+        The documents of files that were removed, such as the temporary
+        copies of PDFs given by their content, are closed.
+
+        """
+        from ._pdfium import LOCK, open_document
+
+        stat = os.stat(path)
+        memo = (str(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if memo not in self._documents:
+                for key in [_ for _ in self._documents
+                            if not os.path.exists(_[0])]:
+                    with LOCK:
+                        self._documents.pop(key).close()
+
+                self._documents[memo] = open_document(path)
+
+            return self._documents[memo]
+
+    def probe(self,
+              path: Union[PathLike, str],
+              timeout: Optional[float] = None,
+              ) -> PdfInfo:
+        """Probe the document information from the parsed document"""
+        from ._pdfium import metadata, page_sizes
+
+        document = self._document(path)
+        entries = metadata(document)
+        sizes = page_sizes(document)
+        return PdfInfo(entries.get("Title", ""),
+                       entries.get("Subject", ""),
+                       entries.get("Keywords", ""),
+                       entries.get("Author", ""),
+                       len(sizes),
+                       sizes,
+                       )
+
+    def notes(self,
+              path: Union[PathLike, str],
+              timeout: Optional[float] = None,
+              first: Optional[int] = None,
+              last: Optional[int] = None,
+              layout: bool = False,
+              ) -> Iterator[str]:
+        """Extract the text of each page from the parsed document"""
+        from ._pdfium import page_count, page_text
+
+        if layout:
+            logger = logging.getLogger(__name__ + ".PdfiumBackend")
+            raise NotImplementedError(
+                f"'{logger.name}' cannot preserve the layout"
+            )
+
+        document = self._document(path)
+        count = page_count(document)
+        for page in range(first or 1, min(last or count, count) + 1):
+            yield page_text(document, page - 1)
+
+    def words(self,
+              path: Union[PathLike, str],
+              timeout: Optional[float] = None,
+              first: Optional[int] = None,
+              last: Optional[int] = None,
+              ) -> Iterator[List[Word]]:
+        """Extract the words of each page from the parsed document"""
+        from ._pdfium import page_count, page_words
+
+        document = self._document(path)
+        count = page_count(document)
+        for page in range(first or 1, min(last or count, count) + 1):
+            yield [Word(*_) for _ in page_words(document, page - 1)]
+
+    def render(self,
+               path: Union[PathLike, str],
+               output: pathlib.Path,
+               first: Optional[int] = None,
+               last: Optional[int] = None,
+               dpi: float = 600,
+               image_format: str = "png",
+               quality: int = 90,
+               width: Optional[int] = None,
+               timeout: Optional[float] = None,
+               height: Optional[int] = None,
+               ) -> None:
+        """Render a range of pages from the parsed document"""
+        from ._pdfium import page_count, render_page
+
+        if image_format == "svg":
+            logger = logging.getLogger(__name__ + ".PdfiumBackend")
+            raise NotImplementedError(
+                f"'{logger.name}' cannot render the 'svg' format"
+            )
+
+        document = self._document(path)
+        count = page_count(document)
+        for page in range(first or 1, min(last or count, count) + 1):
+            image = render_page(document, page - 1, dpi, width,
+                                transparent=image_format != "jpeg",
+                                height=height)
+            if image_format == "jpeg":
+                image.save(_page_name(output, page, count, ".jpg"), "JPEG",
+                           quality=quality)
+            else:
+                image.save(_page_name(output, page, count, ".png"), "PNG")
+
+    def close(self) -> None:
+        """Close the parsed documents"""
+        from ._pdfium import LOCK
+
+        with self._lock, LOCK:
+            for document in self._documents.values():
+                document.close()
+
+            self._documents.clear()
+
+
+BACKENDS: Dict[str, Type[Backend]] = {
+    "poppler": PopplerBackend,
+    "pdfium": PdfiumBackend,
+}
+"""The known backends by name."""
+
+
+@contextlib.contextmanager
+def _open_backend(backend: Union[str, Backend]) -> Iterator[Backend]:
+    """Use the backend creating and closing it if given by name"""
+    if isinstance(backend, Backend):
+        yield backend
+        return
+
+    if backend not in BACKENDS:
+        logger = logging.getLogger(__name__ + ".Backend")
+        raise ValueError(f"'{logger.name}' unknown backend '{backend}'")
+
+    with BACKENDS[backend]() as instance:
+        yield instance
+
+
+_Source = Union[PathLike, str, bytes, bytearray, memoryview, IO[bytes]]
+"""A PDF given by its path, its content, or a binary file-like object."""
+
+
+@contextlib.contextmanager
+def _pdf_file(source: _Source) -> Iterator[Union[PathLike, str]]:
+    """Use the path to the PDF writing it to a temporary file if needed
+
+    The Poppler tools need a file they can seek and several of them read
+    each document so the content is written out once and removed when
+    done.  A path is used as is.
+
+    """
+    if isinstance(source, (str, PathLike)):
+        yield source
+        return
+
+    directory = tempfile.mkdtemp(prefix="beamer2pptx-")
+    try:
+        path = pathlib.Path(directory).joinpath("document.pdf")
+        with open(path, "wb") as stream:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                stream.write(source)
+            else:
+                shutil.copyfileobj(source, stream)
+
+        logger = logging.getLogger(__name__ + "._pdf_file")
+        logger.debug(f"Wrote the PDF to '{path}'")
+        yield path
+    finally:
+        # A backend given by the caller may still hold the file open.
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def probe_pdf(path: _Source,
+              timeout: Optional[float] = None,
+              backend: Union[str, Backend] = "poppler",
+              ) -> PdfInfo:
+    """Probe the document information of the PDF.
 
     Parameters
     ----------
 
-    path: path-like
-        The path to the notes PDF.
+    path: path-like, bytes, or file-like
+        The path to or the content of the PDF.
     timeout: float, optional
         The timeout to pass to :func:`subprocess.run`.
+    backend: str or Backend, optional
+        The name of a backend from :data:`BACKENDS` or the backend with
+        which to read the PDF.
 
     Returns
     -------
 
-    list of str:
-        The text of each note page.
+    PdfInfo:
+        The parsed document information.
 
     Raises
     ------
 
     subprocess.TimeoutError:
-        If the call to :manpage:`pdftotext` times out.
+        If the call to :manpage:`pdfinfo` times out.
     subprocess.CalledProcessError:
-        If the call to :manpage:`pdftotext` raises an error.
+        If the call to :manpage:`pdfinfo` raises an error.
+    RuntimeError:
+        If :manpage:`pdfinfo` does not produce any output.
+    ValueError:
+        If the backend is unknown.
 
     Notes
     -----
 
-    This calls :manpage:`pdftotext` to do the work and splits the result
-    at the formfeeds.
+    The default backend calls :manpage:`pdfinfo` once with ``-f 1 -l N``
+    so the size of every page is reported along with the metadata.  A
+    PDF given by its content is written to a temporary file first since
+    the tools need to seek in the document.
 
     """
-    proc = subprocess.run(["pdftotext", str(path), "-"],
-                          capture_output=True,
-                          timeout=timeout,
-                          text=True,
-                          )
-    try:
-        proc.check_returncode()
-    except Exception:
-        logger = logging.getLogger(__name__ + ".extract_notes")
-        logger.error(f"Error message: '{proc.stderr}'")
-        raise
+    with _pdf_file(path) as name, _open_backend(backend) as reader:
+        return reader.probe(name, timeout)
 
-    # Skip the last one which is just the trailing formfeed.
-    return proc.stdout.split("\f")[:-1]
 
-
-def extract_slides(path: Union[PathLike, str],
-                   directory: str = os.curdir,
-                   timeout: Optional[float] = None,
-                   ) -> List[str]:
-    """Extract the slides from the PDF.
+def extract_aspect_ratio(path: Union[_Source, PdfInfo],
+                         timeout: Optional[float] = None,
+                         backend: Union[str, Backend] = "poppler",
+                         ) -> str:
+    """Extract the aspect ratio from the PDF.
 
     Parameters
     ----------
 
-    path: path-like
-        The path to the slides PDF.
-    directory: str
-        The path to the output directory in which to write the images.
+    path: path-like, bytes, file-like, or PdfInfo
+        The path to or the content of the slides PDF or its probed information.
     timeout: float, optional
         The timeout to pass to :func:`subprocess.run`.
+    backend: str or Backend, optional
+        The backend with which to probe the PDF (see :func:`probe_pdf`).
 
     Returns
     -------
 
-    list of str:
-        The path to each created slide file.
+    str:
+        The aspect ratio of the presentation in the format 'w:h'.
 
     Raises
     ------
 
     subprocess.TimeoutError:
-        If the call to :manpage:`pdftocairo` times out.
+        If the call to :manpage:`pdfinfo` times out.
     subprocess.CalledProcessError:
-        If the call to :manpage:`pdftocairo` raises an error.
+        If the call to :manpage:`pdfinfo` raises an error.
+    RuntimeError:
+        If the size of the pages is unknown.
 
     Notes
     -----
 
-    This calls :manpage:`pdftocairo` to do the work converting each
-    slide page to an image.
+    This uses :func:`probe_pdf` to get the size of the first page and
+    compute the aspect ratio.  It checks against the keys of
+    :data:`ASPECT_RATIOS` rounded to five significant figures and
+    returns the matching one.  Otherwise, it returns the ratio reduced
+    to the nearest fraction with a denominator of at most 100, such as
+    '8:5' for a 16:10 beamer presentation.
 
     """
-    output = pathlib.Path(directory).joinpath(pathlib.Path(path).stem)
-    proc = subprocess.run(["pdftocairo", "-png", "-r", "600", "-transp",
-                           str(path), str(output)
-                           ],
-                          capture_output=True,
-                          timeout=timeout,
-                          text=True,
-                          )
+    info = path if isinstance(path, PdfInfo) \
+        else probe_pdf(path, timeout, backend)
 
-    logger = logging.getLogger(__name__ + ".extract_slides")
-    try:
-        proc.check_returncode()
-    except Exception:
-        logger.error(f"Error message: '{proc.stderr}'")
-        raise
+    logger = logging.getLogger(__name__ + ".extract_aspect_ratio")
+    if not info.page_sizes:
+        raise RuntimeError(
+            f"'{logger.name}' could not locate page size"
+        )
 
-    if proc.stdout != "":
-        logger.info(proc.stdout)
+    page_width, page_height = info.page_sizes[0]
+    ratio = page_width / page_height
+    for key, (width, height) in ASPECT_RATIOS.items():
+        value = width / height
+        if round(value, ndigits=4) == round(ratio, ndigits=4):
+            return key
 
-    return [str(_) for _ in output.parent.glob(output.stem + "*.png")]
+    fraction = fractions.Fraction(ratio).limit_denominator(100)
+    return f"{fraction.numerator}:{fraction.denominator}"
 
 
-def convert(slides: Union[PathLike, str],
-            notes: Optional[Union[PathLike, str]] = None,
-            notes_map: Sequence[int] = [],
-            timeout: Optional[float] = None,
-            ) -> pptx.Presentation:
-    """Convert the presentation to PowerPoint.
+def slide_size(path: Union[_Source, PdfInfo],
+               timeout: Optional[float] = None,
+               backend: Union[str, Backend] = "poppler",
+               ) -> Tuple[Emu, Emu]:
+    """Compute the size of the PowerPoint slides for the PDF.
 
     Parameters
     ----------
 
-    slides: path-like
-        The path to the slides PDF.
-    notes: path-like, optional
-        The path to the notes PDF.
-    notes_map: sequence of integers, optional
-        The slides to which to assign the notes.
+    path: path-like, bytes, file-like, or PdfInfo
+        The path to or the content of the slides PDF or its probed
+        information.
     timeout: float, optional
-        The timeout to pass to subroutines.
+        The timeout to pass to :func:`subprocess.run`.
+    backend: str or Backend, optional
+        The backend with which to probe the PDF (see :func:`probe_pdf`).
+
+    Returns
+    -------
+
+    tuple of Emu:
+        The width and height of the slides.
 
     Raises
     ------
 
     subprocess.TimeoutError:
-        If a call to one of the subroutines times out.
+        If the call to :manpage:`pdfinfo` times out.
     subprocess.CalledProcessError:
-        If a call to one of the subroutines errors.
-    NotImplementedError:
-        If the aspect ratio is unknown.
-    ValueError:
-        If notes_map is present and not the same length as the notes.
+        If the call to :manpage:`pdfinfo` raises an error.
+    RuntimeError:
+        If the size of the pages is unknown.
 
     Notes
     -----
 
-    The ``notes_map`` indicates which slides to which to assign the
-    notes in the presentation.  It it is not present, the notes are
-    assigned to the slides starting at the beginning and ending when no
-    notes are left.  If it is present, it must be the same length as the
-    number of notes slides extracted from ``notes``.  Each entry in
-    ``notes_map`` is the slide (zero based) to which to add the notes.
+    The slides take the preset size from :data:`ASPECT_RATIOS` when the
+    first page has one of its aspect ratios.  Otherwise, the size of the
+    first page is scaled to the height of the presets so text keeps the
+    same size as on the preset slides.  A page too wide for PowerPoint
+    is scaled down to fit.
 
     """
-    logger = logging.getLogger(f"{__name__}.convert")
-    pres = pptx.Presentation()
-
-    title, subject, keywords, author = extract_metadata(slides)
-    pres.core_properties.title = title
-    pres.core_properties.subject = subject
-    pres.core_properties.keywords = keywords
-    pres.core_properties.author = author
+    info = path if isinstance(path, PdfInfo) \
+        else probe_pdf(path, timeout, backend)
 
-    logger.info("Adjust the aspect ratio")
-    aspect = extract_aspect_ratio(slides)
+    aspect = extract_aspect_ratio(info)
     if aspect in ASPECT_RATIOS:
-        pres.slide_width, pres.slide_height = ASPECT_RATIOS[aspect]
-    else:
-        raise NotImplementedError(
-            f"'{logger.name}' unknown aspect ration {aspect}"
-        )
+        return ASPECT_RATIOS[aspect]
 
-    logger.info("Extract the notes")
-    notes_text = [] if notes is None else extract_notes(notes, timeout)
-    logger.debug(f"Found {len(notes_text)} notes")
-    if len(notes_map) == 0:
-        notes_map = range(len(notes_text))
+    page_width, page_height = info.page_sizes[0]
+    height = ASPECT_RATIOS["4:3"][1]
+    width = height * page_width / page_height
+    scale = min(1, _MAX_SLIDE_SIZE / width)
+    return Emu(round(width * scale)), Emu(round(height * scale))
 
-    if len(notes_map) != len(notes_text):
-        raise ValueError(
-            f"'{logger.name}' incompatible note slides to mapping "
-            f"({len(notes_text)} vs. {len(notes_map)})"
-        )
 
-    BLANK_SLIDE = pres.slide_layouts[6]
-    with tempfile.TemporaryDirectory() as temp:
-        logger.info("Generate the slide images")
-        images = extract_slides(slides, temp, timeout)
+def extract_metadata(path: Union[_Source, PdfInfo],
+                     timeout: Optional[float] = None,
+                     backend: Union[str, Backend] = "poppler",
+                     ) -> Tuple[str, str, str, str]:
+    """Extract the metadata from the PDF.
 
-        if len(notes_text) > len(images):
-            logger.warn(
-                f"More notes found than slides "
-                f"({len(notes_text)} vs. {len(images)})"
-            )
+    Parameters
+    ----------
 
-        for count, image in enumerate(sorted(images)):
-            slide = pres.slides.add_slide(BLANK_SLIDE)
-            slide.shapes.add_picture(image, 0, 0, width=pres.slide_width)
-            if count in notes_map:
-                slide.notes_slide.notes_text_frame.text = notes_text[
-                    notes_map.index(count)
-                ]
+    path: path-like, bytes, file-like, or PdfInfo
+        The path to or the content of the slides PDF or its probed information.
+    timeout: float, optional
+        The timeout to pass to :func:`subprocess.run`.
+    backend: str or Backend, optional
+        The backend with which to probe the PDF (see :func:`probe_pdf`).
 
-    return pres
+    Returns
+    -------
+
+    str:
+        The title of the presentation.
+    str:
+        The subject of the presentation.
+    str:
+        The keywords in the presentation.
+    str:
+        The author of the presentation.
+
+    Raises
+    ------
+
+    subprocess.TimeoutError:
+        If the call to :manpage:`pdfinfo` times out.
+    subprocess.CalledProcessError:
+        If the call to :manpage:`pdfinfo` raises an error.
+
+    Notes
+    -----
+
+    This uses :func:`probe_pdf` to extract the metadata.
+
+    """
+    info = path if isinstance(path, PdfInfo) \
+        else probe_pdf(path, timeout, backend)
+    return info.title, info.subject, info.keywords, info.author
+
+
+def extract_notes(path: _Source,
+                  timeout: Optional[float] = None,
+                  backend: Union[str, Backend] = "poppler",
+                  ) -> List[str]:
+    """Extract the notes from the PDF.
+
+    Parameters
+    ----------
+
+    path: path-like, bytes, or file-like
+        The path to or the content of the notes PDF.
+    timeout: float, optional
+        The timeout to pass to :func:`subprocess.run`.
+    backend: str or Backend, optional
+        The backend with which to read the PDF (see :func:`probe_pdf`).
+
+    Returns
+    -------
+
+    list of str:
+        The text of each note page.
+
+    Raises
+    ------
+
+    subprocess.TimeoutError:
+        If the call to :manpage:`pdftotext` times out.
+    subprocess.CalledProcessError:
+        If the call to :manpage:`pdftotext` raises an error.
+
+    Notes
+    -----
+
+    This collects the pages from :func:`iter_notes`.
+
+    """
+    return list(iter_notes(path, timeout, backend=backend))
+
+
+def iter_notes(path: _Source,
+               timeout: Optional[float] = None,
+               first: Optional[int] = None,
+               last: Optional[int] = None,
+               layout: bool = False,
+               backend: Union[str, Backend] = "poppler",
+               ) -> Iterator[str]:
+    """Extract the notes from the PDF one page at a time.
+
+    Parameters
+    ----------
+
+    path: path-like, bytes, or file-like
+        The path to or the content of the notes PDF.
+    timeout: float, optional
+        The time allowed for :manpage:`pdftotext` to finish.
+    first: int, optional
+        The first page (one based) to extract.
+    last: int, optional
+        The last page (one based) to extract.
+    layout: bool, optional
+        Keep the physical layout of the text on the page.
+    backend: str or Backend, optional
+        The backend with which to read the PDF (see :func:`probe_pdf`).
+
+    Yields
+    ------
+
+    str:
+        The text of each note page in page order.
+
+    Raises
+    ------
+
+    subprocess.TimeoutError:
+        If the call to :manpage:`pdftotext` times out.
+    subprocess.CalledProcessError:
+        If the call to :manpage:`pdftotext` raises an error.
+    NotImplementedError:
+        If the backend cannot preserve the layout.
+
+    Notes
+    -----
+
+    The default backend runs :manpage:`pdftotext` once and reads its
+    output from the pipe so only the current page is held in memory.
+    The ``-f``, ``-l``, and ``-layout`` options pass ``first``, ``last``,
+    and ``layout`` along.  Stopping the iteration early kills the
+    process.
+
+    """
+    with _pdf_file(path) as name, _open_backend(backend) as reader:
+        yield from reader.notes(name, timeout, first, last, layout)
+
+
+def iter_words(path: _Source,
+               timeout: Optional[float] = None,
+               first: Optional[int] = None,
+               last: Optional[int] = None,
+               backend: Union[str, Backend] = "poppler",
+               ) -> Iterator[List[Word]]:
+    """Extract the words and their positions one page at a time.
+
+    Parameters
+    ----------
+
+    path: path-like, bytes, or file-like
+        The path to or the content of the PDF.
+    timeout: float, optional
+        The time allowed for :manpage:`pdftotext` to finish.
+    first: int, optional
+        The first page (one based) to extract.
+    last: int, optional
+        The last page (one based) to extract.
+    backend: str or Backend, optional
+        The backend with which to read the PDF (see :func:`probe_pdf`).
+
+    Yields
+    ------
+
+    list of Word:
+        The words of each page in reading order.
+
+    Raises
+    ------
+
+    subprocess.TimeoutError:
+        If the call to :manpage:`pdftotext` times out.
+    subprocess.CalledProcessError:
+        If the call to :manpage:`pdftotext` raises an error.
+
+    Notes
+    -----
+
+    The default backend runs :manpage:`pdftotext` with ``-bbox`` and
+    parses the output incrementally like :func:`iter_notes`.
+
+    """
+    with _pdf_file(path) as name, _open_backend(backend) as reader:
+        yield from reader.words(name, timeout, first, last)
+
+
+def extract_page_labels(path: _Source) -> List[str]:
+    """Extract the label of each page in the PDF.
+
+    Parameters
+    ----------
+
+    path: path-like, bytes, or file-like
+        The path to or the content of the PDF.
+
+    Returns
+    -------
+
+    list of str:
+        The label of each page.
+
+    Raises
+    ------
+
+    ImportError:
+        If :mod:`pypdf` is not installed.
+
+    Notes
+    -----
+
+    The Poppler tools do not report the page labels so they are read
+    using :mod:`pypdf`.  Beamer labels each page with the frame number
+    so all the overlays of a frame share the same label.
+
+    """
+    from ._pdf import page_labels
+
+    with _pdf_file(path) as name:
+        return page_labels(name)
+
+
+def extract_links(path: _Source) -> List[List[Link]]:
+    """Extract the links of each page in the PDF.
+
+    Parameters
+    ----------
+
+    path: path-like, bytes, or file-like
+        The path to or the content of the PDF.
+
+    Returns
+    -------
+
+    list of list of Link:
+        The links of each page.
+
+    Raises
+    ------
+
+    ImportError:
+        If :mod:`pypdf` is not installed.
+
+    Notes
+    -----
+
+    The link annotations are read using :mod:`pypdf` in one pass over
+    the document.  Links to URIs, to destinations in the document such
+    as those of the beamer navigation symbols, and the actions going to
+    the first, last, next, or previous page are kept.  Links to other
+    documents or running other actions are skipped.
+
+    """
+    from ._pdf import page_links
+
+    with _pdf_file(path) as name:
+        return [[Link(*_) for _ in page] for page in page_links(name)]
+
+
+def extract_media(path: _Source,
+                  directory: str = os.curdir,
+                  referenced: bool = True,
+                  ) -> List[List[Media]]:
+    """Extract the media files played on each page of the PDF.
+
+    Parameters
+    ----------
+
+    path: path-like, bytes, or file-like
+        The path to or the content of the PDF.
+    directory: str
+        The path to the output directory in which to write the embedded
+        media files.
+    referenced: bool, optional
+        Include the media referenced by file name next to the PDF.
+
+    Returns
+    -------
+
+    list of list of Media:
+        The media files of each page.
+
+    Raises
+    ------
+
+    ImportError:
+        If :mod:`pypdf` is not installed.
+
+    Notes
+    -----
+
+    The movie annotations of the beamer ``multimedia`` package and the
+    screen annotations with a rendition action, such as those of the
+    ``media9`` package, are read using :mod:`pypdf` in one pass over the
+    document.  The media embedded in the PDF are written to
+    ``directory``.  The media referenced by a relative file name are
+    looked up in the directory of the PDF and skipped when they do not
+    exist.  References to absolute paths or outside of that directory
+    are always skipped, as are all references when the PDF is given as
+    bytes or a file-like object.
+
+    """
+    from ._pdf import page_media
+
+    logger = logging.getLogger(__name__ + ".extract_media")
+    referenced = referenced and isinstance(path, (str, PathLike))
+    media = []
+    with _pdf_file(path) as name:
+        for page, found in enumerate(page_media(name, directory, referenced),
+                                     start=1):
+            media.append([Media(*_) for _ in found
+                          if os.path.isfile(_[0])])
+            for missing in (_[0] for _ in found
+                            if not os.path.isfile(_[0])):
+                logger.warning(f"Skipping the missing media '{missing}' "
+                               f"on page {page}")
+
+    return media
+
+
+def infer_notes_map(slides: _Source,
+                    notes: _Source,
+                    timeout: Optional[float] = None,
+                    backend: Union[str, Backend] = "poppler",
+                    notes_text: Optional[Sequence[str]] = None,
+                    ) -> Optional[List[str]]:
+    """Infer the slide to which each notes page belongs.
+
+    Parameters
+    ----------
+
+    slides: path-like, bytes, or file-like
+        The path to or the content of the slides PDF.
+    notes: path-like, bytes, or file-like
+        The path to or the content of the notes PDF.
+    timeout: float, optional
+        The timeout to pass to :func:`subprocess.run`.
+    backend: str or Backend, optional
+        The backend with which to read the PDFs (see :func:`probe_pdf`).
+    notes_text: sequence of str, optional
+        The text of the notes pages if it was already extracted.
+
+    Returns
+    -------
+
+    list of str or None:
+        The page label of the slide for each notes page suitable for
+        the ``notes_map`` of :func:`convert`, or ``None`` if a notes
+        page cannot be matched to a slide.
+
+    Raises
+    ------
+
+    ImportError:
+        If :mod:`pypdf` is not installed.
+
+    Notes
+    -----
+
+    Beamer labels each notes page with the number of its frame so the
+    page labels of the notes are used when every one of them labels a
+    slide.  Otherwise, the first line of each slide is taken as its
+    frame title and the lines of each notes page are looked up in an
+    index of the titles.  This reads each document once.  A title
+    shared by different frames does not identify a slide.
+
+    """
+    logger = logging.getLogger(__name__ + ".infer_notes_map")
+    with _pdf_file(slides) as slides, _pdf_file(notes) as notes:
+        labels, mapping = _label_notes(slides, notes, logger)
+        if mapping is not None:
+            return mapping
+
+        with _open_backend(backend) as reader:
+            return _title_notes(labels, reader.notes(slides, timeout),
+                                reader.notes(notes, timeout)
+                                if notes_text is None else notes_text,
+                                logger)
+
+
+def _label_notes(slides: Union[PathLike, str],
+                 notes: Union[PathLike, str],
+                 logger: logging.Logger,
+                 ) -> Tuple[List[str], Optional[List[str]]]:
+    """Get the slide labels and the notes labels if they all match"""
+    from ._pdf import has_page_labels
+
+    labels = extract_page_labels(slides)
+    if has_page_labels(notes):
+        notes_labels = extract_page_labels(notes)
+        known = set(labels)
+        if all(_ in known for _ in notes_labels):
+            return labels, notes_labels
+
+        logger.debug("The notes page labels do not match the slides")
+
+    return labels, None
+
+
+def _title_notes(labels: Sequence[str],
+                 slides_text: Iterable[str],
+                 notes_text: Iterable[str],
+                 logger: logging.Logger,
+                 ) -> Optional[List[str]]:
+    """Map each notes page to the slide whose frame title it shows"""
+    titles: Dict[str, str] = {}
+    ambiguous = set()
+    for label, text in zip(labels, slides_text):
+        title = next((_.strip() for _ in text.splitlines() if _.strip()),
+                     "")
+        if title in titles and titles[title] != label:
+            ambiguous.add(title)
+
+        titles[title] = label
+
+    for title in ambiguous:
+        del titles[title]
+
+    titles.pop("", None)
+    mapping = []
+    for page, text in enumerate(notes_text, start=1):
+        for line in text.splitlines():
+            if line.strip() in titles:
+                mapping.append(titles[line.strip()])
+                break
+        else:
+            logger.debug(f"No frame title found on notes page {page}")
+            return None
+
+    return mapping
+
+
+def extract_page_count(path: Union[_Source, PdfInfo],
+                       timeout: Optional[float] = None,
+                       backend: Union[str, Backend] = "poppler",
+                       ) -> int:
+    """Extract the number of pages in the PDF.
+
+    Parameters
+    ----------
+
+    path: path-like, bytes, file-like, or PdfInfo
+        The path to or the content of the PDF or its probed information.
+    timeout: float, optional
+        The timeout to pass to :func:`subprocess.run`.
+    backend: str or Backend, optional
+        The backend with which to probe the PDF (see :func:`probe_pdf`).
+
+    Returns
+    -------
+
+    int:
+        The number of pages in the document.
+
+    Raises
+    ------
+
+    subprocess.TimeoutError:
+        If the call to :manpage:`pdfinfo` times out.
+    subprocess.CalledProcessError:
+        If the call to :manpage:`pdfinfo` raises an error.
+    RuntimeError:
+        If the page count cannot be found.
+
+    Notes
+    -----
+
+    This uses :func:`probe_pdf` to read the ``Pages`` entry.
+
+    """
+    info = path if isinstance(path, PdfInfo) \
+        else probe_pdf(path, timeout, backend)
+    if info.pages < 1:
+        logger = logging.getLogger(__name__ + ".extract_page_count")
+        raise RuntimeError(
+            f"'{logger.name}' could not locate page count"
+        )
+
+    return info.pages
+
+
+class SlideCache:
+    """An on-disk cache of rendered slide images.
+
+    The images are stored under a key computed from the content of the
+    page and the render settings so unchanged pages can be reused across
+    conversions.  The least recently used images are evicted once the
+    cache grows beyond ``max_size``.
+
+    Parameters
+    ----------
+
+    directory: path-like
+        The directory in which to store the images.  It is created if it
+        does not exist.
+    max_size: int, optional
+        The maximum size of the cache in bytes.  There is no limit if it
+        is ``None``.
+
+    Notes
+    -----
+
+    The page content is fingerprinted using :mod:`pypdf` which must be
+    installed to use the cache.
+
+    """
+
+    def __init__(self,
+                 directory: Union[PathLike, str],
+                 max_size: Optional[int] = 2 ** 30,
+                 ) -> None:
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self._fingerprints: OrderedDict[Tuple[str, int, int], List[str]] = \
+            collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def fingerprints(self, path: _Source) -> List[str]:
+        """Compute the fingerprint of each page of the PDF
+
+        The fingerprints of the most recently used documents are
+        remembered until their file is modified so rendering several
+        documents one range at a time parses each of them once.
+
+        """
+        from ._pdf import page_fingerprints
+
+        with _pdf_file(path) as name:
+            stat = os.stat(name)
+            memo = (str(name), stat.st_mtime_ns, stat.st_size)
+            with self._lock:
+                if memo in self._fingerprints:
+                    self._fingerprints.move_to_end(memo)
+                    return self._fingerprints[memo]
+
+            fingerprints = page_fingerprints(name)
+            with self._lock:
+                self._fingerprints[memo] = fingerprints
+                while len(self._fingerprints) > _FINGERPRINT_DOCUMENTS:
+                    self._fingerprints.popitem(last=False)
+
+            return fingerprints
+
+    @staticmethod
+    def key(fingerprint: str, options: Sequence[str]) -> str:
+        """Compute the cache key of a page rendered with ``options``"""
+        sha = hashlib.sha256(fingerprint.encode())
+        for option in options:
+            sha.update(b"\0" + option.encode())
+
+        return sha.hexdigest()
+
+    def get(self, key: str) -> Optional[pathlib.Path]:
+        """Get the cached image for ``key`` if present"""
+        for entry in self.directory.glob(key + ".*"):
+            try:
+                os.utime(entry)
+            except FileNotFoundError:
+                continue
+
+            return entry
+
+        return None
+
+    def put(self, key: str, image: Union[PathLike, str]) -> pathlib.Path:
+        """Store a copy of ``image`` under ``key``
+
+        The cache is not trimmed until :meth:`evict` is called.
+
+        """
+        image = pathlib.Path(image)
+        entry = self.directory.joinpath(key + image.suffix)
+        handle, partial = tempfile.mkstemp(dir=self.directory,
+                                           prefix=f".{entry.name}.")
+        os.close(handle)
+        try:
+            shutil.copyfile(image, partial)
+            shutil.copymode(image, partial)
+            os.replace(partial, entry)
+        except BaseException:
+            _remove([partial])
+            raise
+
+        return entry
+
+    def evict(self) -> None:
+        """Remove the least recently used images until under the limit"""
+        if self.max_size is None:
+            return
+
+        entries = []
+        for entry in self.directory.glob("[!.]*"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        size = sum(_[1] for _ in entries)
+        logger = logging.getLogger(__name__ + ".SlideCache")
+        for _, entry_size, entry in sorted(entries, key=lambda _: _[0]):
+            if size <= self.max_size:
+                break
+
+            logger.debug(f"Evicting '{entry}'")
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+
+            size -= entry_size
+
+
+def slide_pixels(aspect: Union[str, Tuple[int, int]],
+                 display: Tuple[int, int],
+                 ) -> Tuple[int, int]:
+    """Compute the size in pixels of a slide filling a display.
+
+    Parameters
+    ----------
+
+    aspect: str or tuple of int
+        The aspect ratio of the slides as a key of :data:`ASPECT_RATIOS`
+        or the width and height of the slides (see :func:`slide_size`).
+    display: tuple of int
+        The width and height in pixels of the display.
+
+    Returns
+    -------
+
+    tuple of int:
+        The width and height in pixels of the largest slide that fits on
+        the display while keeping the aspect ratio.
+
+    Raises
+    ------
+
+    KeyError:
+        If the aspect ratio is unknown.
+
+    """
+    width, height = ASPECT_RATIOS[aspect] if isinstance(aspect, str) \
+        else aspect
+    scale = min(display[0] / width, display[1] / height)
+    return round(width * scale), round(height * scale)
+
+
+def _render_options(dpi: float = 600,
+                    image_format: str = "png",
+                    quality: int = 90,
+                    width: Optional[int] = None,
+                    height: Optional[int] = None,
+                    ) -> List[str]:
+    """Build the options passed to :manpage:`pdftocairo`"""
+    if image_format == "svg":
+        return ["-svg"]
+
+    if image_format not in IMAGE_FORMATS:
+        logger = logging.getLogger(__name__ + ".extract_slides")
+        raise ValueError(
+            f"'{logger.name}' unknown image format '{image_format}'"
+        )
+
+    if image_format == "jpeg":
+        options = ["-jpeg", "-jpegopt", f"quality={quality}"]
+    else:
+        options = ["-png", "-transp"]
+
+    if width is None:
+        options.extend(["-r", f"{dpi:g}"])
+    else:
+        options.extend(["-scale-to-x", str(width), "-scale-to-y",
+                        "-1" if height is None else str(height)])
+
+    return options
+
+
+def _choose_format(image: pathlib.Path, quality: int = 90) -> pathlib.Path:
+    """Replace a PNG slide with a JPEG if the JPEG is smaller
+
+    Slides with only a few colors are text or line art where JPEG
+    artifacts are visible so they are always kept as PNG.
+
+    """
+    with Image.open(image) as png:
+        if png.mode in ("RGBA", "LA", "P"):
+            flat = Image.new("RGB", png.size, "white")
+            flat.paste(png, mask=png.convert("RGBA"))
+        else:
+            flat = png.convert("RGB")
+
+    if flat.getcolors(1024) is not None:
+        return image
+
+    buffer = io.BytesIO()
+    flat.save(buffer, "JPEG", quality=quality, optimize=True)
+    if buffer.tell() >= image.stat().st_size:
+        return image
+
+    jpeg = image.with_suffix(".jpg")
+    jpeg.write_bytes(buffer.getvalue())
+    image.unlink()
+    return jpeg
+
+
+def _page_ranges(pages: Sequence[int], jobs: int) -> List[Tuple[int, int]]:
+    """Split the pages into contiguous ranges for ``jobs`` processes.
+
+    The ranges are one based and inclusive to match the ``-f`` and
+    ``-l`` options of the Poppler tools.
+
+    """
+    size = math.ceil(len(pages) / max(1, jobs))
+    ranges: List[Tuple[int, int]] = []
+    for page in sorted(pages):
+        if ranges and page == ranges[-1][1] + 1 \
+                and ranges[-1][1] - ranges[-1][0] + 1 < size:
+            ranges[-1] = (ranges[-1][0], page)
+        else:
+            ranges.append((page, page))
+
+    return ranges
+
+
+def _page_number(image: Union[PathLike, str]) -> int:
+    """Get the page number :manpage:`pdftocairo` encoded in a file name"""
+    match = re.search(r"-(\d+)$", pathlib.Path(image).stem)
+    return int(match.group(1)) if match else 0
+
+
+def _page_name(output: pathlib.Path,
+               page: int,
+               count: int,
+               suffix: str,
+               ) -> pathlib.Path:
+    """Name the image of a page the way :manpage:`pdftocairo` does"""
+    return output.with_name(f"{output.name}-{page:0{len(str(count))}d}"
+                            f"{suffix}")
+
+
+def _reuse_cached(cache: SlideCache,
+                  fingerprints: Sequence[str],
+                  pages: Sequence[int],
+                  settings: Sequence[str],
+                  output: pathlib.Path,
+                  count: int,
+                  ) -> Dict[int, str]:
+    """Copy the cached images of the pages and key the missing ones"""
+    keys: Dict[int, str] = {}
+    for page in pages:
+        key = cache.key(fingerprints[page - 1], settings)
+        hit = cache.get(key)
+        if hit is None:
+            keys[page] = key
+            continue
+
+        shutil.copyfile(hit, _page_name(output, page, count, hit.suffix))
+
+    return keys
+
+
+def _close_cache(cache: SlideCache,
+                 reused: int,
+                 pages: int,
+                 logger: logging.Logger,
+                 ) -> None:
+    """Report the reused pages and evict the images over the cache size"""
+    logger.info(f"Reused {reused} of {pages} pages from the cache")
+    if reused < pages:
+        cache.evict()
+
+
+def _collect_slides(output: pathlib.Path,
+                    first: Optional[int],
+                    last: Optional[int],
+                    image_format: str,
+                    quality: int,
+                    jobs: int,
+                    cache: Optional[SlideCache],
+                    keys: Dict[int, str],
+                    ) -> List[pathlib.Path]:
+    """Gather the rendered images of the pages in order
+
+    The 'auto' format picks the format of the newly rendered images and
+    they are added to the cache.
+
+    """
+    suffixes = (".svg",) if image_format == "svg" else (".png", ".jpg")
+    images = sorted((_ for _ in output.parent.glob(output.name + "-*")
+                     if _.suffix in suffixes
+                     and (first or 0) <= _page_number(_)
+                     and (last is None or _page_number(_) <= last)),
+                    key=_page_number)
+    if image_format == "auto":
+        rendered = [_ for _ in images
+                    if cache is None or _page_number(_) in keys]
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            chosen = dict(zip(rendered, pool.map(_choose_format, rendered,
+                                                 [quality] * len(rendered))))
+
+        images = [chosen.get(_, _) for _ in images]
+
+    if cache is not None:
+        for image in images:
+            if _page_number(image) in keys:
+                cache.put(keys[_page_number(image)], image)
+
+    return images
+
+
+class _Spooled:
+    """A mixin for parts reading their content from a file when needed
+
+    Only the path is held in memory so the parts of a large presentation
+    are read one at a time when it is saved.  The file is removed when
+    the part is garbage collected.
+
+    """
+
+    def __init__(self, path: str, *args: Any, **kwargs: Any) -> None:
+        self._path = path
+        weakref.finalize(self, _remove, [path])
+        super().__init__(*args, **kwargs)
+
+    @property
+    def _blob(self) -> bytes:
+        with open(self._path, "rb") as stream:
+            return stream.read()
+
+    @_blob.setter
+    def _blob(self, value: bytes) -> None:
+        """Ignore the content set by the part constructors"""
+
+
+class _SpooledPart(_Spooled, Part):  # type: ignore[misc]
+    """A generic part spooled to a file"""
+
+
+class _SpooledImagePart(_Spooled, ImagePart):  # type: ignore[misc]
+    """An image part spooled to a file"""
+
+
+class _ImageIndex:
+    """The image parts of a presentation indexed by their content
+
+    Identical images are stored once in the package and shared by every
+    slide showing them.  The index is built once so adding an image does
+    not search the whole package like :mod:`pptx` does.  When ``spool``
+    is set, the new images are moved to files read when the package is
+    saved instead of being held in memory.
+
+    """
+
+    def __init__(self, pres: pptx.Presentation, spool: bool = False) -> None:
+        self.package = pres.part.package
+        self.spool = spool
+        self.parts: Dict[str, Any] = {}
+        self.added = 0
+        self.reused = 0
+        for part in self.package.iter_parts():
+            if part.content_type.startswith("image/"):
+                self.parts[hashlib.sha1(part.blob).hexdigest()] = part
+
+    def get(self, path: Union[PathLike, str]) -> Any:
+        """Get the part holding the image creating it if needed"""
+        blob = pathlib.Path(path).read_bytes()
+        sha1 = hashlib.sha1(blob).hexdigest()
+        if sha1 in self.parts:
+            self.reused += 1
+            return self.parts[sha1]
+
+        suffix = pathlib.Path(path).suffix
+        image = None if suffix == ".svg" \
+            else PptxImage.from_blob(blob, str(path))
+        part: Part
+        if self.spool:
+            handle, spooled = tempfile.mkstemp(prefix="beamer2pptx-",
+                                               suffix=suffix)
+            os.close(handle)
+            shutil.move(str(path), spooled)
+            if image is None:
+                part = _SpooledPart(spooled,
+                                    self.package.next_image_partname("svg"),
+                                    "image/svg+xml",
+                                    package=self.package,
+                                    )
+            else:
+                part = _SpooledImagePart(
+                    spooled,
+                    self.package.next_image_partname(image.ext),
+                    image.content_type,
+                    package=self.package,
+                    blob=b"",
+                    filename=image.filename,
+                )
+        elif image is None:
+            part = Part(self.package.next_image_partname("svg"),
+                        "image/svg+xml",
+                        package=self.package,
+                        blob=blob,
+                        )
+        else:
+            part = ImagePart.new(self.package, image)
+
+        self.added += 1
+        self.parts[sha1] = part
+        return part
+
+
+def _add_svg(picture: Picture, svg_part: Part) -> None:
+    """Attach an SVG image to a picture to show in place of its image
+
+    The original image of the picture is kept as the fallback for
+    applications without SVG support.
+
+    """
+    rId = picture.part.relate_to(svg_part, RT.IMAGE)
+
+    blip = picture._element.blipFill.blip  # type: ignore[union-attr]
+    extensions = blip.find(qn("a:extLst"))
+    if extensions is None:
+        extensions = etree.SubElement(blip, qn("a:extLst"))
+
+    extension = etree.SubElement(extensions, qn("a:ext"),
+                                 uri=_SVG_EXTENSION)
+    svg_blip = etree.SubElement(extension, f"{{{_SVG_NAMESPACE}}}svgBlip",
+                                nsmap={"asvg": _SVG_NAMESPACE})
+    svg_blip.set(qn("r:embed"), rId)
+
+
+def _drive(step: Awaitable[Any]) -> Any:
+    """Run a step of the pipeline that never suspends without a loop"""
+    coro = cast(Coroutine[Any, Any, Any], step)
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+
+    coro.close()
+    raise RuntimeError("The step suspended outside of an event loop")
+
+
+def _iterate(steps: AsyncGenerator[Any, None]) -> Iterator[Any]:
+    """Iterate over a generator of the pipeline without a loop"""
+    try:
+        while True:
+            try:
+                item = _drive(steps.__anext__())
+            except StopAsyncIteration:
+                return
+
+            yield item
+    finally:
+        _drive(steps.aclose())
+
+
+class _Runner:
+    """The steps of the conversion pipeline run in the calling thread
+
+    The pipeline is written once as coroutines awaiting these steps.
+    They return without suspending so :func:`_drive` runs the pipeline
+    without an event loop while the tasks it spawns run on ``pool``, or
+    a pool of ``jobs`` threads when it is needed.  :class:`_LoopRunner`
+    runs the same pipeline in an event loop.
+
+    """
+
+    def __init__(self,
+                 reader: Backend,
+                 jobs: int = 1,
+                 pool: Optional[Executor] = None,
+                 ) -> None:
+        self.name = reader.name
+        self._reader = reader
+        self._jobs = jobs
+        self._pool = pool
+        self._owned: Optional[Executor] = None
+
+    def __enter__(self) -> "_Runner":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        if self._owned is not None:
+            self._owned.shutdown()
+
+    async def call(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Run a step parsing or writing in process"""
+        return function(*args)
+
+    async def probe(self,
+                    path: Union[PathLike, str],
+                    timeout: Optional[float],
+                    ) -> PdfInfo:
+        """Probe the document information (see :func:`probe_pdf`)"""
+        return probe_pdf(path, timeout, self._reader)
+
+    async def notes(self,
+                    path: Union[PathLike, str],
+                    timeout: Optional[float],
+                    ) -> List[str]:
+        """Extract the text of each page (see :func:`extract_notes`)"""
+        return extract_notes(path, timeout, self._reader)
+
+    async def words(self,
+                    path: Union[PathLike, str],
+                    timeout: Optional[float],
+                    first: int,
+                    last: int,
+                    ) -> List[List[Word]]:
+        """Extract the words of the pages (see :func:`iter_words`)"""
+        return list(iter_words(path, timeout, first, last, self._reader))
+
+    async def render(self,
+                     path: Union[PathLike, str],
+                     output: pathlib.Path,
+                     first: Optional[int],
+                     last: Optional[int],
+                     dpi: float,
+                     image_format: str,
+                     quality: int,
+                     width: Optional[int],
+                     timeout: Optional[float],
+                     height: Optional[int],
+                     ) -> None:
+        """Render a range of pages (see :meth:`Backend.render`)"""
+        self._reader.render(path, output, first, last, dpi, image_format,
+                            quality, width, timeout, height)
+
+    async def gather(self,
+                     steps: Sequence[Callable[[], Awaitable[Any]]],
+                     jobs: int,
+                     ) -> List[Any]:
+        """Run the steps with ``jobs`` at a time and get their results"""
+        if jobs == 1 or len(steps) < 2:
+            return [await _() for _ in steps]
+
+        with ThreadPoolExecutor(max_workers=min(jobs, len(steps))) as pool:
+            futures = [pool.submit(lambda step: _drive(step()), _)
+                       for _ in steps]
+            return [_.result() for _ in futures]
+
+    def spawn(self, function: Callable[..., Awaitable[Any]],
+              *args: Any) -> Any:
+        """Start running a coroutine function as a task"""
+        pool = self._pool
+        if pool is None:
+            if self._owned is None:
+                self._owned = ThreadPoolExecutor(max_workers=self._jobs)
+
+            pool = self._owned
+
+        return pool.submit(lambda: _drive(function(*args)))
+
+    async def join(self, task: Any) -> Any:
+        """Wait for a task and get its result"""
+        return cast(Future, task).result()
+
+    async def drop(self, task: Any) -> Any:
+        """Stop a task or get its result if it already finished"""
+        future = cast(Future, task)
+        if future.cancel() or future.exception() is not None:
+            return None
+
+        return future.result()
+
+
+def extract_slides(path: _Source,
+                   directory: str = os.curdir,
+                   timeout: Optional[float] = None,
+                   jobs: int = 1,
+                   info: Optional[PdfInfo] = None,
+                   cache: Optional[SlideCache] = None,
+                   dpi: float = 600,
+                   image_format: str = "png",
+                   quality: int = 90,
+                   width: Optional[int] = None,
+                   first: Optional[int] = None,
+                   last: Optional[int] = None,
+                   backend: Union[str, Backend] = "poppler",
+                   on_event: Optional[Callable[[Event], None]] = None,
+                   height: Optional[int] = None,
+                   ) -> List[str]:
+    """Extract the slides from the PDF.
+
+    Parameters
+    ----------
+
+    path: path-like, bytes, or file-like
+        The path to or the content of the slides PDF.
+    directory: str
+        The path to the output directory in which to write the images.
+    timeout: float, optional
+        The timeout to pass to :func:`subprocess.run`.
+    jobs: int, optional
+        The number of :manpage:`pdftocairo` processes to run
+        concurrently.  A value less than one uses all available CPUs.
+    info: PdfInfo, optional
+        The probed information of ``path`` used to split the pages
+        without calling :manpage:`pdfinfo` again.
+    cache: SlideCache, optional
+        The cache from which to reuse the images of unchanged pages.
+    dpi: float, optional
+        The resolution at which to render the slides.
+    image_format: str, optional
+        The image format from :data:`IMAGE_FORMATS`.  The 'auto' format
+        renders a PNG and keeps a JPEG instead when it is smaller.  The
+        'svg' format renders vector images instead.
+    quality: int, optional
+        The JPEG quality between 0 and 100.
+    width: int, optional
+        The width in pixels of the images.  This overrides ``dpi`` and
+        the height follows from the page size.
+    first: int, optional
+        The first page (one based) to render.
+    last: int, optional
+        The last page (one based) to render.
+    backend: str or Backend, optional
+        The backend with which to render the PDF (see :func:`probe_pdf`).
+    on_event: callable, optional
+        The function to call with the 'render' :class:`Event` of each
+        page when the pages are rendered.
+    height: int, optional
+        The height in pixels of the images when ``width`` is given
+        instead of following from the page size.
+
+    Returns
+    -------
+
+    list of str:
+        The path to each created slide file in page order.
+
+    Raises
+    ------
+
+    subprocess.TimeoutError:
+        If the call to :manpage:`pdftocairo` times out.
+    subprocess.CalledProcessError:
+        If the call to :manpage:`pdftocairo` raises an error.
+    ImportError:
+        If ``cache`` is given and :mod:`pypdf` is not installed.
+    ValueError:
+        If the image format or the backend is unknown.
+    NotImplementedError:
+        If the backend cannot render the image format.
+
+    Notes
+    -----
+
+    The default backend calls :manpage:`pdftocairo` to do the work
+    converting each slide page to an image.  When ``jobs`` is larger
+    than one, the document is split into contiguous page ranges using
+    the ``-f`` and ``-l`` options and each range is rendered by its own
+    process.  The same options limit the rendering to the pages from
+    ``first`` to ``last`` when either is given.  When a ``cache`` is
+    given, only the pages missing from the cache are rendered and the
+    new images are added to the cache.  The key of each cached image
+    includes the backend and the render settings.
+
+    """
+    logger = logging.getLogger(__name__ + ".extract_slides")
+    with _pdf_file(path) as path, _open_backend(backend) as reader:
+        images, reused = _drive(_render_pages(
+            _Runner(reader), path, directory, timeout, jobs, info, cache,
+            dpi, image_format, quality, width, first, last, on_event, height
+        ))
+
+    if cache is not None:
+        _close_cache(cache, reused, len(images), logger)
+
+    return images
+
+
+async def _render_pages(runner: _Runner,
+                        path: Union[PathLike, str],
+                        directory: str,
+                        timeout: Optional[float],
+                        jobs: int,
+                        info: Optional[PdfInfo],
+                        cache: Optional[SlideCache],
+                        dpi: float,
+                        image_format: str,
+                        quality: int,
+                        width: Optional[int],
+                        first: Optional[int],
+                        last: Optional[int],
+                        on_event: Optional[Callable[[Event], None]],
+                        height: Optional[int],
+                        ) -> Tuple[List[str], int]:
+    """Render the slides and count the pages reused from the cache
+
+    This is :func:`extract_slides` without evicting from the cache so
+    :func:`iter_slides` evicts once after all its page ranges.
+
+    """
+    start = time.time()
+    logger = logging.getLogger(__name__ + ".extract_slides")
+    if jobs < 1:
+        jobs = os.cpu_count() or 1
+
+    options = _render_options(dpi, image_format, quality, width, height)
+    output = pathlib.Path(directory).joinpath(pathlib.Path(path).stem)
+    keys: Dict[int, str] = {}
+    starts: Dict[Tuple[int, int], float] = {}
+
+    async def render(low: Optional[int],
+                     high: Optional[int],
+                     name: pathlib.Path,
+                     ) -> None:
+        starts[low or 1, high or _LAST_PAGE] = time.time()
+        await runner.render(path, name, low, high, dpi, image_format,
+                            quality, width, timeout, height)
+
+    if cache is None and jobs == 1 and image_format != "svg":
+        await render(first, last, output)
+    else:
+        if cache is None:
+            count = extract_page_count(await runner.probe(path, timeout)
+                                       if info is None else info)
+        else:
+            fingerprints = await runner.call(cache.fingerprints, path)
+            count = len(fingerprints)
+
+        pages: Sequence[int] = range(first or 1,
+                                     min(last or count, count) + 1)
+        if cache is not None:
+            keys = await runner.call(_reuse_cached, cache, fingerprints,
+                                     pages, [runner.name, *options,
+                                             image_format, str(quality)],
+                                     output, count)
+            pages = list(keys)
+
+        if image_format == "svg":
+            ranges = [(_, _) for _ in pages]
+        else:
+            ranges = _page_ranges(pages, jobs)
+
+        logger.debug(f"Rendering page ranges {ranges}")
+        await runner.gather([functools.partial(
+            render, low, high, _page_name(output, low, count, ".svg")
+            if image_format == "svg" else output
+        ) for low, high in ranges], jobs)
+
+    def collect() -> List[pathlib.Path]:
+        suffixes = (".svg",) if image_format == "svg" else (".png", ".jpg")
+        ends: Dict[int, float] = {}
+        for image in output.parent.glob(output.name + "-*"):
+            with contextlib.suppress(FileNotFoundError):
+                if image.suffix in suffixes:
+                    ends[_page_number(image)] = image.stat().st_mtime
+
+        images = _collect_slides(output, first, last, image_format, quality,
+                                 jobs, cache, keys)
+        for image in images:
+            page = _page_number(image)
+            end = ends.get(page, start)
+            low, begin = next(((low, begin) for (low, high), begin
+                               in starts.items() if low <= page <= high),
+                              (page, end))
+            if page > low:
+                begin = max(begin, ends.get(page - 1, begin))
+
+            _emit_at(on_event, "render", begin, max(begin, end), path=path,
+                     page=page, cached=cache is not None and page not in keys,
+                     bytes=image.stat().st_size, backend=runner.name,
+                     format=image_format)
+
+        return images
+
+    images = await runner.call(collect)
+    reused = 0 if cache is None else len(images) - len(keys)
+    return [str(_) for _ in images], reused
+
+
+def iter_slides(path: _Source,
+                directory: str = os.curdir,
+                timeout: Optional[float] = None,
+                jobs: int = 1,
+                info: Optional[PdfInfo] = None,
+                cache: Optional[SlideCache] = None,
+                dpi: float = 600,
+                image_format: str = "png",
+                quality: int = 90,
+                width: Optional[int] = None,
+                window: Optional[int] = None,
+                pages: Optional[Sequence[int]] = None,
+                pool: Optional[Executor] = None,
+                backend: Union[str, Backend] = "poppler",
+                on_event: Optional[Callable[[Event], None]] = None,
+                height: Optional[int] = None,
+                ) -> Iterator[str]:
+    """Render the slides from the PDF one page at a time.
+
+    Parameters
+    ----------
+
+    path: path-like, bytes, or file-like
+        The path to or the content of the slides PDF.
+    directory: str
+        The path to the output directory in which to write the images.
+    timeout: float, optional
+        The timeout to pass to :func:`subprocess.run`.
+    jobs: int, optional
+        The number of page ranges to render concurrently.  A value less
+        than one uses all available CPUs.
+    info: PdfInfo, optional
+        The probed information of ``path``.
+    cache: SlideCache, optional
+        The cache from which to reuse the images of unchanged pages.
+    dpi: float, optional
+        The resolution at which to render the slides.
+    image_format: str, optional
+        The image format (see :func:`extract_slides`).
+    quality: int, optional
+        The JPEG quality between 0 and 100.
+    width: int, optional
+        The width in pixels of the images.
+    window: int, optional
+        The maximum number of images in ``directory`` at once.  The
+        default is twice the number of jobs times 8 pages.
+    pages: sequence of int, optional
+        The pages (one based) to render.  The default is all pages.
+    pool: concurrent.futures.Executor, optional
+        The executor on which to render the pages.  This allows sharing
+        a pool between conversions.  A pool of ``jobs`` threads is used
+        if it is not given.
+    backend: str or Backend, optional
+        The backend with which to render the PDF (see :func:`probe_pdf`).
+    on_event: callable, optional
+        The function to call with the 'render' :class:`Event` of each
+        page (see :func:`extract_slides`).
+    height: int, optional
+        The height in pixels of the images when ``width`` is given.
+
+    Yields
+    ------
+
+    str:
+        The path to the image of each slide in page order.  The image
+        is removed when the next one is requested.
+
+    Raises
+    ------
+
+    subprocess.TimeoutError:
+        If a call to :manpage:`pdftocairo` times out.
+    subprocess.CalledProcessError:
+        If a call to :manpage:`pdftocairo` raises an error.
+
+    Notes
+    -----
+
+    The pages are split into contiguous ranges of ``window`` divided by
+    twice ``jobs`` pages.  Each range is rendered by one call to
+    :func:`extract_slides` as its own task so the first slides are
+    available while the rest are rendered without starting a process
+    per page.  Ranges are only submitted while at most ``window`` images
+    are waiting to be consumed which bounds the disk space used.
+
+    """
+    if jobs < 1:
+        jobs = os.cpu_count() or 1
+
+    with contextlib.ExitStack() as stack:
+        path = stack.enter_context(_pdf_file(path))
+        reader = stack.enter_context(_open_backend(backend))
+        runner = stack.enter_context(_Runner(reader, jobs, pool))
+        yield from _iterate(_stream_slides(
+            runner, path, directory, timeout, jobs, info, cache, dpi,
+            image_format, quality, width, window, pages, on_event, height
+        ))
+
+
+async def _stream_slides(runner: _Runner,
+                         path: Union[PathLike, str],
+                         directory: str,
+                         timeout: Optional[float],
+                         jobs: int,
+                         info: Optional[PdfInfo],
+                         cache: Optional[SlideCache],
+                         dpi: float,
+                         image_format: str,
+                         quality: int,
+                         width: Optional[int],
+                         window: Optional[int],
+                         pages: Optional[Sequence[int]],
+                         on_event: Optional[Callable[[Event], None]],
+                         height: Optional[int],
+                         ) -> AsyncGenerator[str, None]:
+    """Render the slides in page ranges as they are consumed
+
+    This is :func:`iter_slides` with each page range rendered as a task
+    of ``runner``.
+
+    """
+    if jobs < 1:
+        jobs = os.cpu_count() or 1
+
+    window = max(1, 2 * jobs * _CHUNK_PAGES if window is None else window)
+    logger = logging.getLogger(__name__ + ".iter_slides")
+    pending: Deque[Tuple[int, Any]] = collections.deque()
+    info = await runner.probe(path, timeout) if info is None else info
+    if pages is None:
+        pages = range(1, extract_page_count(info) + 1)
+
+    size = max(1, window // (2 * jobs))
+    waiting = done = hits = 0
+    ranges = collections.deque(
+        _page_ranges(pages, math.ceil(len(pages) / size))
+    )
+    logger.debug(f"Streaming {len(pages)} pages in {len(ranges)} ranges "
+                 f"with a window of {window}")
+    try:
+        while True:
+            while ranges and (not pending or waiting + ranges[0][1]
+                              - ranges[0][0] + 1 <= window):
+                first, last = ranges.popleft()
+                waiting += last - first + 1
+                pending.append((last - first + 1, runner.spawn(
+                    _render_pages, runner, path, directory, timeout, 1,
+                    info, cache, dpi, image_format, quality, width, first,
+                    last, on_event, height
+                )))
+
+            if not pending:
+                break
+
+            count, task = pending.popleft()
+            waiting -= count
+            images, reused = await runner.join(task)
+            done += len(images)
+            hits += reused
+            try:
+                for image in images:
+                    yield image
+                    _remove([image])
+            finally:
+                _remove(images)
+    finally:
+        for _, task in pending:
+            result = await runner.drop(task)
+            if result is not None:
+                _remove(result[0])
+
+        if cache is not None and done > 0:
+            await runner.call(_close_cache, cache, hits, done, logger)
+
+
+def _remove(paths: Sequence[Union[PathLike, str]]) -> None:
+    """Remove the files ignoring those that are already gone"""
+    for path in paths:
+        try:
+            pathlib.Path(path).unlink()
+        except FileNotFoundError:
+            pass
+
+
+_CUSTOM_PROPERTIES = "/docProps/custom.xml"
+_CUSTOM_PROPERTIES_TYPE = \
+    "application/vnd.openxmlformats-officedocument.custom-properties+xml"
+_CUSTOM_NAMESPACE = \
+    "http://schemas.openxmlformats.org/officeDocument/2006/custom-properties"
+_VT_NAMESPACE = \
+    "http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes"
+_FMTID = "{D5CDD505-2E9C-101B-9397-08002B2CF9AE}"
+_FINGERPRINTS = "beamer2pptx.fingerprints"
+"""The custom property holding the fingerprint of each slide."""
+
+
+def _read_fingerprints(pres: pptx.Presentation) -> List[str]:
+    """Read the slide fingerprints recorded in the presentation"""
+    try:
+        part = pres.part.package.part_related_by(RT.CUSTOM_PROPERTIES)
+    except KeyError:
+        return []
+
+    root = etree.fromstring(part.blob)
+    for prop in root.iterfind(f"{{{_CUSTOM_NAMESPACE}}}property"):
+        if prop.get("name") == _FINGERPRINTS:
+            return "".join(prop.itertext()).split()
+
+    return []
+
+
+def _write_fingerprints(pres: pptx.Presentation,
+                        fingerprints: Sequence[str],
+                        ) -> None:
+    """Record the slide fingerprints in the custom document properties"""
+    package = pres.part.package
+    try:
+        part = package.part_related_by(RT.CUSTOM_PROPERTIES)
+        root = etree.fromstring(part.blob)
+    except KeyError:
+        part = Part(PackURI(_CUSTOM_PROPERTIES),
+                    _CUSTOM_PROPERTIES_TYPE,
+                    package=package,
+                    )
+        package.relate_to(part, RT.CUSTOM_PROPERTIES)
+        root = etree.Element(f"{{{_CUSTOM_NAMESPACE}}}Properties",
+                             nsmap={None: _CUSTOM_NAMESPACE,
+                                    "vt": _VT_NAMESPACE})
+
+    props = root.findall(f"{{{_CUSTOM_NAMESPACE}}}property")
+    for prop in props:
+        if prop.get("name") == _FINGERPRINTS:
+            break
+    else:
+        pid = max([int(_.get("pid", 1)) for _ in props] + [1]) + 1
+        prop = etree.SubElement(root, f"{{{_CUSTOM_NAMESPACE}}}property",
+                                fmtid=_FMTID, pid=str(pid),
+                                name=_FINGERPRINTS)
+
+    for child in list(prop):
+        prop.remove(child)
+
+    value = etree.SubElement(prop, f"{{{_VT_NAMESPACE}}}lpwstr")
+    value.text = " ".join(fingerprints)
+    part._blob = etree.tostring(root, xml_declaration=True,
+                                encoding="UTF-8", standalone=True)
+
+
+def _slide_keys(path: Union[PathLike, str],
+                settings: Sequence[str],
+                cache: Optional[SlideCache] = None,
+                ) -> Optional[List[str]]:
+    """Compute the fingerprint of each slide if :mod:`pypdf` is present"""
+    try:
+        if cache is None:
+            from ._pdf import page_fingerprints
+            fingerprints = page_fingerprints(path)
+        else:
+            fingerprints = cache.fingerprints(path)
+    except ImportError:
+        logger = logging.getLogger(__name__ + ".convert")
+        logger.info("Install pypdf to record the slide fingerprints")
+        return None
+
+    return [SlideCache.key(_, settings) for _ in fingerprints]
+
+
+def _delete_slide(pres: pptx.Presentation, index: int) -> None:
+    """Remove a slide and its parts from the presentation"""
+    slides = pres.slides._sldIdLst
+    slide = slides[index]
+    pres.part.drop_rel(slide.rId)
+    slides.remove(slide)
+
+
+def _letterbox(page_size: Tuple[float, float],
+               slide_size: Tuple[int, int],
+               ) -> Tuple[int, int, int, int]:
+    """Fit a page in the middle of a slide keeping its aspect ratio"""
+    if round(page_size[0] / page_size[1], ndigits=4) \
+            == round(slide_size[0] / slide_size[1], ndigits=4):
+        return 0, 0, slide_size[0], slide_size[1]
+
+    scale = min(slide_size[0] / page_size[0], slide_size[1] / page_size[1])
+    width = min(slide_size[0], round(page_size[0] * scale))
+    height = min(slide_size[1], round(page_size[1] * scale))
+    return ((slide_size[0] - width) // 2, (slide_size[1] - height) // 2,
+            width, height)
+
+
+def _set_picture(slide: Slide,
+                 image: Union[PathLike, str],
+                 vector: Optional[str],
+                 box: Tuple[int, int, int, int],
+                 images: _ImageIndex,
+                 ) -> None:
+    """Set the image of the slide replacing the existing picture
+
+    The new picture fills the ``box`` given by its left, top, width, and
+    height.  It takes the place of the old one in the z-order and the
+    images of the old one are dropped from the package.  The image parts
+    are shared with other slides showing the same image.
+
+    """
+    tree = slide.shapes._spTree
+    index = len(tree)
+    for shape in list(slide.shapes):
+        if not isinstance(shape, Picture):
+            continue
+
+        index = min(index, tree.index(shape._element))
+        blips = [_.get(qn("r:embed"))
+                 for _ in shape._element.iter(qn("a:blip"),
+                                              f"{{{_SVG_NAMESPACE}}}svgBlip")]
+        tree.remove(shape._element)
+        for rId in blips:
+            slide.part.drop_rel(rId)
+
+    image_part = images.get(image)
+    rId = slide.part.relate_to(image_part, RT.IMAGE)
+    picture = cast(Picture, slide.shapes._shape_factory(
+        slide.shapes._add_pic_from_image_part(image_part, rId,
+                                              *(Emu(_) for _ in box))
+    ))
+    if vector is not None:
+        _add_svg(picture, images.get(vector))
+
+    tree.remove(picture._element)
+    tree.insert(index, picture._element)
+
+
+def _place(area: Union[Word, Link, Media],
+           page_size: Tuple[float, float],
+           box: Tuple[int, int, int, int],
+           ) -> Tuple[Emu, Emu, Emu, Emu]:
+    """Map an area of a page onto the picture of the page filling box"""
+    scale = box[2] / page_size[0]
+    return (Emu(box[0] + round(area.x_min * scale)),
+            Emu(box[1] + round(area.y_min * scale)),
+            Emu(round((area.x_max - area.x_min) * scale)),
+            Emu(round((area.y_max - area.y_min) * scale)))
+
+
+def _lines(words: Sequence[Word]) -> List[Word]:
+    """Join the words following each other on the same line
+
+    A word continues the line when its middle is within the height of
+    the line and it starts after the beginning of the line and at most
+    that height after its end.
+
+    """
+    lines: List[Word] = []
+    for word in words:
+        if lines:
+            line = lines[-1]
+            height = line.y_max - line.y_min
+            if line.y_min <= (word.y_min + word.y_max) / 2 <= line.y_max \
+                    and line.x_min < word.x_min <= line.x_max + height:
+                lines[-1] = Word(f"{line.text} {word.text}", line.x_min,
+                                 min(line.y_min, word.y_min), word.x_max,
+                                 max(line.y_max, word.y_max))
+                continue
+
+        lines.append(word)
+
+    return lines
+
+
+def _set_text(slide: Slide,
+              words: Sequence[Word],
+              page_size: Tuple[float, float],
+              box: Tuple[int, int, int, int],
+              ) -> None:
+    """Set the text boxes of the slide replacing the existing ones
+
+    Each line of ``words`` on the page of ``page_size`` gets a text box
+    over the line in the picture filling ``box``.  The text has no fill
+    so it can be searched and selected without hiding the picture.
+
+    """
+    _remove_shapes(slide, _TEXT_NAME)
+    for line in _lines(words):
+        shape = slide.shapes.add_textbox(*_place(line, page_size, box))
+        shape.name = _TEXT_NAME
+        frame = shape.text_frame
+        frame.margin_left = frame.margin_right = Emu(0)
+        frame.margin_top = frame.margin_bottom = Emu(0)
+        frame.word_wrap = False
+        frame.auto_size = MSO_AUTO_SIZE.NONE
+        run = frame.paragraphs[0].add_run()
+        run.text = line.text
+        run.font.size = max(Pt(1), Emu(round(shape.height / _LINE_HEIGHT)))
+        run.font.fill.background()
+
+
+def _remove_shapes(slide: Slide, name: str) -> None:
+    """Remove the shapes with the name and their relationships"""
+    tree = slide.shapes._spTree
+    for shape in list(slide.shapes):
+        if shape.name != name:
+            continue
+
+        rIds = {value for _ in shape._element.iter()
+                for key, value in _.attrib.items()
+                if key.startswith(f"{{{_R_NAMESPACE}}}") and value}
+        tree.remove(shape._element)
+        for rId in rIds:
+            slide.part.drop_rel(rId)
+
+
+def _posters(image: Union[PathLike, str],
+             media: Sequence[Media],
+             page_size: Tuple[float, float],
+             ) -> List[io.BytesIO]:
+    """Crop the area of each media from the image of the page as a PNG"""
+    if not media:
+        return []
+
+    posters = []
+    with Image.open(image) as picture:
+        scale = picture.width / page_size[0]
+        for clip in media:
+            poster = io.BytesIO()
+            picture.crop((round(clip.x_min * scale),
+                          round(clip.y_min * scale),
+                          round(clip.x_max * scale),
+                          round(clip.y_max * scale))).save(poster, "PNG")
+            poster.seek(0)
+            posters.append(poster)
+
+    return posters
+
+
+def _set_media(slide: Slide,
+               media: Sequence[Media],
+               posters: Sequence[io.BytesIO],
+               page_size: Tuple[float, float],
+               box: Tuple[int, int, int, int],
+               ) -> None:
+    """Set the movies of the slide replacing the existing ones
+
+    Each media file is played in its area of the picture filling
+    ``box`` with its poster frame from :func:`_posters` so the slide
+    looks the same until it is played.
+
+    """
+    _remove_shapes(slide, _MEDIA_NAME)
+    for clip, poster in zip(media, posters):
+        shape = slide.shapes.add_movie(
+            clip.path, *_place(clip, page_size, box),
+            poster_frame_image=poster,
+            mime_type=mimetypes.guess_type(clip.path)[0] or "video/unknown",
+        )
+        shape.name = _MEDIA_NAME
+
+
+def _notes_index(notes_map: Sequence[Union[int, str]],
+                 shown: Sequence[int],
+                 labels: Optional[Sequence[str]] = None,
+                 ) -> Dict[int, List[int]]:
+    """Index the notes pages assigned to each slide
+
+    The integers in ``notes_map`` are slides and the strings are the
+    page labels of the slides.  A label is resolved to the last slide
+    with it unless frames apart from each other share it.
+
+    """
+    logger = logging.getLogger(__name__ + ".convert")
+    targets: Dict[str, int] = {}
+    ambiguous = set()
+    if labels is not None:
+        previous = None
+        for count, page in enumerate(shown):
+            label = labels[page - 1]
+            if label != previous and label in targets:
+                ambiguous.add(label)
+
+            targets[label] = count
+            previous = label
+
+    index: Dict[int, List[int]] = {}
+    for page, target in enumerate(notes_map):
+        if isinstance(target, str):
+            if target in ambiguous:
+                raise ValueError(
+                    f"'{logger.name}' notes page {page + 1} is mapped to "
+                    f"the label '{target}' shared by several frames"
+                )
+
+            if target not in targets:
+                raise ValueError(
+                    f"'{logger.name}' notes page {page + 1} is mapped to "
+                    f"the unknown label '{target}'"
+                )
+
+            slide = targets[target]
+        else:
+            slide = target
+
+        if not 0 <= slide < len(shown):
+            raise ValueError(
+                f"'{logger.name}' notes page {page + 1} is mapped to slide "
+                f"{slide} outside of 0 to {len(shown) - 1}"
+            )
+
+        index.setdefault(slide, []).append(page)
+
+    return index
+
+
+def _open_presentation(base: Optional[Union[PathLike, str]],
+                       mode: str,
+                       overlays: str,
+                       display: Optional[Union[str, Tuple[int, int]]],
+                       logger: logging.Logger,
+                       ) -> pptx.Presentation:
+    """Check the conversion options and open the presentation to fill"""
+    if mode not in MODES:
+        raise ValueError(f"'{logger.name}' unknown mode '{mode}'")
+
+    if overlays not in OVERLAYS:
+        raise ValueError(f"'{logger.name}' unknown overlays '{overlays}'")
+
+    if isinstance(display, str) and display not in DISPLAYS:
+        raise ValueError(f"'{logger.name}' unknown display '{display}'")
+
+    return pptx.Presentation() if base is None \
+        else pptx.Presentation(str(base))
+
+
+class _Plan(NamedTuple):
+    """The slides of a conversion and those that need rendering"""
+
+    width: Optional[int]
+    height: Optional[int]
+    shown: Sequence[int]
+    sizes: List[Tuple[float, float]]
+    boxes: List[Tuple[int, int, int, int]]
+    notes_index: Dict[int, List[int]]
+    keys: Optional[List[str]]
+    changed: List[int]
+
+
+def _plan(pres: pptx.Presentation,
+          slides: Union[PathLike, str],
+          info: PdfInfo,
+          notes_text: Sequence[str],
+          notes_map: Sequence[Union[int, str]],
+          backend: str,
+          cache: Optional[SlideCache],
+          dpi: float,
+          image_format: str,
+          quality: int,
+          display: Optional[Union[str, Tuple[int, int]]],
+          mode: str,
+          overlays: str,
+          searchable: bool,
+          links: bool,
+          media: bool,
+          update: bool,
+          on_event: Optional[Callable[[Event], None]],
+          logger: logging.Logger,
+          ) -> _Plan:
+    """Set up the presentation and plan the slides to render
+
+    This sets the metadata and the slide size, checks the notes mapping,
+    and removes the slides of a previous conversion that are no longer
+    needed.
+
+    """
+    title, subject, keywords, author = extract_metadata(info)
+    pres.core_properties.title = title
+    pres.core_properties.subject = subject
+    pres.core_properties.keywords = keywords
+    pres.core_properties.author = author
+
+    logger.info("Adjust the slide size")
+    size = slide_size(info)
+    pres.slide_width, pres.slide_height = size
+
+    if len(notes_map) != 0 and len(notes_map) != len(notes_text):
+        raise ValueError(
+            f"'{logger.name}' incompatible note slides to mapping "
+            f"({len(notes_text)} vs. {len(notes_map)})"
+        )
+
+    shown: Sequence[int] = range(1, info.pages + 1)
+    labels: Optional[List[str]] = None
+    if overlays == "last":
+        labels = extract_page_labels(slides)
+        shown = [page for page, (label, following)
+                 in enumerate(zip(labels, labels[1:] + [None]), start=1)
+                 if label != following]
+        logger.info(f"Collapsed {info.pages} pages into {len(shown)} "
+                    "slides")
+
+    sizes = [info.page_sizes[page - 1] if page <= len(info.page_sizes)
+             else info.page_sizes[0] for page in shown]
+    boxes = [_letterbox(_, size) for _ in sizes]
+    width = height = None
+    if display is not None:
+        width, height = slide_pixels(size, DISPLAYS[display]
+                                     if isinstance(display, str)
+                                     else display)
+        if any(_ != (0, 0, *size) for _ in boxes):
+            logger.info("Keep the aspect ratio of the letterboxed pages")
+            height = None
+
+    if mode == "vector":
+        settings = [backend, mode, *_render_options(_FALLBACK_DPI)]
+    else:
+        settings = [backend, mode,
+                    *_render_options(dpi, image_format, quality, width,
+                                     height),
+                    image_format, str(quality)]
+
+    if searchable:
+        settings.append("searchable")
+
+    if links:
+        settings.append("links")
+
+    if media:
+        settings.append("media")
+
+    if len(notes_map) == 0:
+        notes_index = {_: [_] for _ in range(min(len(notes_text),
+                                                 len(shown)))}
+        if len(notes_text) > len(shown):
+            logger.warn(
+                f"More notes found than slides "
+                f"({len(notes_text)} vs. {len(shown)})"
+            )
+    else:
+        if labels is None \
+                and any(isinstance(_, str) for _ in notes_map):
+            labels = extract_page_labels(slides)
+
+        notes_index = _notes_index(notes_map, shown, labels)
+
+    keys = None
+    if update or cache is not None:
+        with _span(on_event, "fingerprints", path=slides):
+            keys = _slide_keys(slides, settings, cache)
+
+    if keys is not None:
+        keys = [keys[page - 1] for page in shown]
+
+    recorded = _read_fingerprints(pres) if update else []
+    while len(pres.slides) > len(shown):
+        _delete_slide(pres, len(pres.slides) - 1)
+
+    changed = [count for count in range(len(shown))
+               if keys is None
+               or count >= len(pres.slides)
+               or count >= len(recorded)
+               or recorded[count] != keys[count]]
+    if update:
+        logger.info(f"Updating {len(changed)} of {len(shown)} slides")
+
+    return _Plan(width, height, shown, sizes, boxes, notes_index, keys,
+                 changed)
+
+
+def _fill_slide(pres: pptx.Presentation,
+                plan: _Plan,
+                count: int,
+                rendered: Optional[Tuple[str, Optional[str]]],
+                notes_text: Sequence[str],
+                index: _ImageIndex,
+                on_event: Optional[Callable[[Event], None]],
+                words: Optional[Sequence[Word]] = None,
+                clips: Optional[Sequence[Media]] = None,
+                ) -> None:
+    """Add or update a slide with its rendered images and its notes"""
+    if count < len(pres.slides):
+        slide = pres.slides[count]
+    else:
+        slide = pres.slides.add_slide(pres.slide_layouts[6])
+
+    if rendered is not None:
+        image, vector = rendered
+        with _span(on_event, "insert", slide=count,
+                   bytes=os.path.getsize(image)):
+            # The image is moved away when it is spooled.
+            posters = _posters(image, clips or [], plan.sizes[count])
+            _set_picture(slide, image, vector, plan.boxes[count], index)
+            _set_text(slide, words or [], plan.sizes[count],
+                      plan.boxes[count])
+            _set_media(slide, clips or [], posters, plan.sizes[count],
+                       plan.boxes[count])
+
+    notes_index = plan.notes_index
+    if count in notes_index or slide.has_notes_slide:
+        text = "\n".join(notes_text[_] for _ in notes_index.get(count, []))
+        frame = slide.notes_slide.notes_text_frame
+        if frame is not None and frame.text != text:
+            frame.text = text
+
+
+def _set_links(pres: pptx.Presentation,
+               plan: _Plan,
+               count: int,
+               links: Sequence[Link],
+               ) -> None:
+    """Set the links of a slide replacing the existing ones
+
+    Each link gets a transparent rectangle over its area in the picture
+    that opens its URI or jumps to the slide showing its page when
+    clicked.  A page that is not shown jumps to the next slide shown.
+
+    """
+    slide = pres.slides[count]
+    _remove_shapes(slide, _LINK_NAME)
+    for link in links:
+        if isinstance(link.target, int):
+            target = bisect.bisect_left(plan.shown, link.target + 1)
+            if target == len(plan.shown):
+                continue
+
+        shape = slide.shapes.add_shape(
+            MSO_SHAPE.RECTANGLE,
+            *_place(link, plan.sizes[count], plan.boxes[count])
+        )
+        shape.name = _LINK_NAME
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = RGBColor(0xFF, 0xFF, 0xFF)
+        etree.SubElement(shape._element.spPr.find(qn("a:solidFill"))[0],
+                         qn("a:alpha"), val="0")
+        shape.line.fill.background()
+        shape.shadow.inherit = False
+        if isinstance(link.target, int):
+            shape.click_action.target_slide = pres.slides[target]
+        else:
+            shape.click_action.hyperlink.address = link.target
+
+
+def _extract_clips(slides: Union[PathLike, str],
+                   directory: str,
+                   media: bool,
+                   referenced: bool,
+                   on_event: Optional[Callable[[Event], None]],
+                   ) -> Dict[int, List[Media]]:
+    """Extract the media of each page by page number if they are needed"""
+    if not media:
+        return {}
+
+    with _span(on_event, "media", path=slides) as args:
+        found = extract_media(slides, directory, referenced)
+        args["files"] = sum(len(_) for _ in found)
+
+    return dict(enumerate(found, start=1))
+
+
+def _link_slides(pres: pptx.Presentation,
+                 plan: _Plan,
+                 slides: Union[PathLike, str],
+                 links: bool,
+                 on_event: Optional[Callable[[Event], None]],
+                 ) -> None:
+    """Set the links of every slide or remove those of the new images
+
+    The links are set once all the slides exist so they can jump
+    forward.
+
+    """
+    found: Optional[List[List[Link]]] = None
+    if links:
+        with _span(on_event, "links", path=slides):
+            found = extract_links(slides)
+
+    changed = set(plan.changed)
+    for count, page in enumerate(plan.shown):
+        if found is not None:
+            _set_links(pres, plan, count,
+                       found[page - 1] if page <= len(found) else [])
+        elif count in changed:
+            _set_links(pres, plan, count, [])
+
+
+def _finish(pres: pptx.Presentation,
+            plan: _Plan,
+            index: _ImageIndex,
+            slides: Union[PathLike, str],
+            start: float,
+            on_event: Optional[Callable[[Event], None]],
+            logger: logging.Logger,
+            ) -> None:
+    """Record the fingerprints of the slides and report the conversion"""
+    logger.info(f"Added {index.added} images and reused {index.reused} "
+                "duplicates")
+    if plan.keys is not None:
+        _write_fingerprints(pres, plan.keys)
+
+    _emit(on_event, "convert", start, path=slides, slides=len(plan.shown),
+          rendered=len(plan.changed), added=index.added,
+          reused=index.reused)
+
+
+async def _infer_notes(runner: _Runner,
+                       slides: Union[PathLike, str],
+                       notes: Union[PathLike, str],
+                       timeout: Optional[float],
+                       notes_text: Sequence[str],
+                       ) -> Optional[List[str]]:
+    """Infer the notes mapping reading the slides only when needed
+
+    This is :func:`infer_notes_map` with the text of the slides read
+    through ``runner`` when the page labels do not match.
+
+    """
+    logger = logging.getLogger(__name__ + ".infer_notes_map")
+    labels, mapping = await runner.call(_label_notes, slides, notes, logger)
+    if mapping is None:
+        slides_text = await runner.notes(slides, timeout)
+        mapping = await runner.call(_title_notes, labels, slides_text,
+                                    notes_text, logger)
+
+    return cast(Optional[List[str]], mapping)
+
+
+async def _convert(runner: _Runner,
+                   slides: Union[PathLike, str],
+                   notes: Optional[Union[PathLike, str]],
+                   notes_map: Sequence[Union[int, str]],
+                   timeout: Optional[float],
+                   jobs: int,
+                   cache: Optional[SlideCache],
+                   dpi: float,
+                   image_format: str,
+                   quality: int,
+                   display: Optional[Union[str, Tuple[int, int]]],
+                   mode: str,
+                   window: Optional[int],
+                   base: Optional[Union[PathLike, str]],
+                   overlays: str,
+                   on_event: Optional[Callable[[Event], None]],
+                   low_memory: bool,
+                   searchable: bool,
+                   links: bool,
+                   media: bool,
+                   referenced: bool,
+                   ) -> pptx.Presentation:
+    """Convert the presentation with the steps of ``runner``
+
+    This is the pipeline of :func:`convert` and :func:`convert_async`
+    once the PDFs are files.
+
+    """
+    start = time.time()
+    logger = logging.getLogger(f"{__name__}.convert")
+    pres = await runner.call(_open_presentation, base, mode, overlays,
+                             display, logger)
+    with _span(on_event, "probe", path=slides, backend=runner.name) as args:
+        info = await runner.probe(slides, timeout)
+        args["pages"] = info.pages
+
+    logger.info("Extract the notes")
+    with _span(on_event, "notes", path=notes, backend=runner.name) as args:
+        notes_text = [] if notes is None \
+            else await runner.notes(notes, timeout)
+        args["pages"] = len(notes_text)
+
+    logger.debug(f"Found {len(notes_text)} notes")
+    if notes is not None and len(notes_map) == 0:
+        with _span(on_event, "infer_notes_map", path=notes) as args:
+            try:
+                inferred = await _infer_notes(runner, slides, notes, timeout,
+                                              notes_text)
+            except ImportError:
+                logger.info("Install pypdf to infer the notes mapping")
+                inferred = None
+
+            args["inferred"] = inferred is not None
+
+        if inferred is not None:
+            logger.info("Inferred the slide of each notes page")
+            notes_map = inferred
+
+    plan = await runner.call(_plan, pres, slides, info, notes_text,
+                             notes_map, runner.name, cache, dpi,
+                             image_format, quality, display, mode, overlays,
+                             searchable, links, media, base is not None,
+                             on_event, logger)
+    pages = [plan.shown[_] for _ in plan.changed]
+    words: Dict[int, List[Word]] = {}
+    if searchable and pages:
+        with _span(on_event, "words", path=slides, backend=runner.name):
+            words = dict(enumerate(await runner.words(slides, timeout,
+                                                      min(pages),
+                                                      max(pages)),
+                                   start=min(pages)))
+
+    with tempfile.TemporaryDirectory() as temp:
+        logger.info("Generate the slide images")
+        vectors: Optional[AsyncGenerator[str, None]] = None
+        if mode == "vector":
+            vectors = _stream_slides(runner, slides, temp, timeout, jobs,
+                                     info, cache, dpi, "svg", quality, None,
+                                     window, pages, on_event, None)
+            images = _stream_slides(runner, slides, temp, timeout, jobs,
+                                    info, cache, _FALLBACK_DPI, "png", 90,
+                                    None, window, pages, on_event, None)
+        else:
+            images = _stream_slides(runner, slides, temp, timeout, jobs,
+                                    info, cache, dpi, image_format, quality,
+                                    plan.width, window, pages, on_event,
+                                    plan.height)
+
+        try:
+            clips = await runner.call(_extract_clips, slides, temp,
+                                      media and bool(pages), referenced,
+                                      on_event)
+            replace = set(plan.changed)
+            index = await runner.call(_ImageIndex, pres, low_memory)
+            for count, page in enumerate(plan.shown):
+                rendered = None
+                if count in replace:
+                    rendered = (await images.__anext__(),
+                                None if vectors is None
+                                else await vectors.__anext__())
+
+                await runner.call(_fill_slide, pres, plan, count, rendered,
+                                  notes_text, index, on_event,
+                                  words.get(page), clips.get(page))
+        finally:
+            await images.aclose()
+            if vectors is not None:
+                await vectors.aclose()
+
+    await runner.call(_link_slides, pres, plan, slides, links, on_event)
+    await runner.call(_finish, pres, plan, index, slides, start, on_event,
+                      logger)
+    return pres
+
+
+def convert(slides: _Source,
+            notes: Optional[_Source] = None,
+            notes_map: Sequence[Union[int, str]] = [],
+            timeout: Optional[float] = None,
+            jobs: int = 1,
+            cache: Optional[SlideCache] = None,
+            dpi: float = 600,
+            image_format: str = "png",
+            quality: int = 90,
+            display: Optional[Union[str, Tuple[int, int]]] = None,
+            mode: str = "raster",
+            window: Optional[int] = None,
+            base: Optional[Union[PathLike, str]] = None,
+            pool: Optional[Executor] = None,
+            overlays: str = "builds",
+            backend: Union[str, Backend] = "poppler",
+            on_event: Optional[Callable[[Event], None]] = None,
+            low_memory: bool = False,
+            searchable: bool = False,
+            links: bool = False,
+            media: bool = False,
+            ) -> pptx.Presentation:
+    """Convert the presentation to PowerPoint.
+
+    Parameters
+    ----------
+
+    slides: path-like, bytes, or file-like
+        The path to or the content of the slides PDF.
+    notes: path-like, bytes, or file-like, optional
+        The path to or the content of the notes PDF.
+    notes_map: sequence of integers or strings, optional
+        The slides to which to assign the notes.
+    timeout: float, optional
+        The timeout to pass to subroutines.
+    jobs: int, optional
+        The number of concurrent processes to use when rendering the
+        slides (see :func:`extract_slides`).
+    cache: SlideCache, optional
+        The cache of previously rendered slide images.
+    dpi: float, optional
+        The resolution at which to render the slides.
+    image_format: str, optional
+        The slide image format from :data:`IMAGE_FORMATS`.
+    quality: int, optional
+        The JPEG quality between 0 and 100.
+    display: str or tuple of int, optional
+        The name of a target display from :data:`DISPLAYS` or its width
+        and height in pixels.  When given, the slides are rendered to
+        fill it (see :func:`slide_pixels`) instead of at ``dpi``.  The
+        images then match the pixel grid of the slide exactly unless
+        some pages are letterboxed.
+    mode: str, optional
+        How to embed the slides from :data:`MODES`.  The 'raster' mode
+        inserts an image of each slide.  The 'vector' mode inserts an
+        SVG of each slide with a low resolution PNG fallback.
+    window: int, optional
+        The maximum number of rendered images waiting to be inserted
+        (see :func:`iter_slides`).
+    base: path-like, optional
+        The path to a presentation previously generated from ``slides``
+        to update instead of starting from an empty presentation.
+    pool: concurrent.futures.Executor, optional
+        The executor on which to render the slides (see
+        :func:`iter_slides`).
+    overlays: str, optional
+        How to convert the overlays of a frame from :data:`OVERLAYS`.
+        The 'builds' option creates a slide for every overlay.  The
+        'last' option only creates a slide for the last overlay.
+    backend: str or Backend, optional
+        The backend with which to read and render the PDFs (see
+        :func:`probe_pdf`).  A backend given by name is shared by the
+        slides and notes and closed when the conversion is done.
+    on_event: callable, optional
+        The function to call with an :class:`Event` as each stage of
+        the conversion ends.  A :class:`Trace` collects them.
+    low_memory: bool, optional
+        Keep the slide images in temporary files until the presentation
+        is saved instead of in memory.
+    searchable: bool, optional
+        Lay invisible text boxes with the words of each page over the
+        slide images (see :func:`iter_words`).
+    links: bool, optional
+        Make the links of each page clickable on the slide images (see
+        :func:`extract_links`).
+    media: bool, optional
+        Play the movies of each page on the slide images (see
+        :func:`extract_media`).
+
+    Raises
+    ------
+
+    subprocess.TimeoutError:
+        If a call to one of the subroutines times out.
+    subprocess.CalledProcessError:
+        If a call to one of the subroutines errors.
+    ValueError:
+        If notes_map is present and not the same length as the notes or
+        refers to an unknown slide or the mode, overlays, or backend are
+        unknown.
+    ImportError:
+        If overlays is 'last', notes_map has labels, or links or media
+        is true and :mod:`pypdf` is not installed.
+
+    Notes
+    -----
+
+    The ``notes_map`` indicates which slides to which to assign the
+    notes in the presentation.  It it is not present, it is inferred
+    using :func:`infer_notes_map` when possible.  Otherwise, the notes
+    are assigned to the slides starting at the beginning and ending when
+    no notes are left.  If it is present, it must be the same length as the
+    number of notes slides extracted from ``notes``.  Each entry in
+    ``notes_map`` is the slide (zero based) to which to add the notes or
+    the page label of that slide (see :func:`extract_page_labels`).  A
+    label shared by the overlays of a frame refers to the slide of the
+    last overlay.  Several notes pages mapped to the same slide are
+    joined in order.
+
+    The slides are inserted as soon as their images are rendered using
+    :func:`iter_slides` so the rendering overlaps with the assembly of
+    the presentation.  Identical images, such as repeated title slides
+    or unchanged overlays, are stored once and shared by the slides.
+
+    When :mod:`pypdf` is installed and a ``base`` or a ``cache`` is
+    given, a fingerprint of each page and the render settings is
+    recorded in the custom document properties.  Fingerprinting decodes
+    every page so it is skipped otherwise.  When updating a ``base``
+    presentation, only the slides whose fingerprint changed are rendered
+    and replaced.  Slides are added or removed to match the number of
+    pages and the notes are updated.
+
+    The content of a PDF given as bytes or a file-like object is written
+    to a temporary file once and shared by every stage of the conversion.
+
+    With ``searchable``, each line of text on a page gets a native text
+    box over it without any fill.  The slides still show the images but
+    their text can be searched, selected, and indexed.
+
+    With ``links``, each link of a page gets a transparent shape over it
+    that opens its URI or jumps to the slide of its target page.  Links
+    to pages collapsed with ``overlays`` jump to the slide of the last
+    overlay.
+
+    With ``media``, each movie of a page is added where it plays on the
+    slide with the area of the slide image under it as its poster frame.
+    The movies are held in memory even with ``low_memory``.
+
+    :mod:`pptx` holds the content of every part in memory until the
+    presentation is saved.  With ``low_memory``, the new images are
+    moved to temporary files instead and each one is only read while it
+    is written to the saved package.  The files are removed when the
+    presentation is garbage collected.
+
+    """
+    referenced = isinstance(slides, (str, PathLike))
+    with contextlib.ExitStack() as stack:
+        slides = stack.enter_context(_pdf_file(slides))
+        if notes is not None:
+            notes = stack.enter_context(_pdf_file(notes))
+
+        reader = stack.enter_context(_open_backend(backend))
+        runner = stack.enter_context(_Runner(
+            reader, os.cpu_count() or 1 if jobs < 1 else jobs, pool
+        ))
+        return _drive(_convert(
+            runner, slides, notes, notes_map, timeout, jobs, cache, dpi,
+            image_format, quality, display, mode, window, base, overlays,
+            on_event, low_memory, searchable, links, media, referenced
+        ))
+
+
+def update(path: Union[PathLike, str],
+           slides: _Source,
+           notes: Optional[_Source] = None,
+           notes_map: Sequence[Union[int, str]] = [],
+           **kwargs: Any,
+           ) -> pptx.Presentation:
+    """Update a presentation previously generated by :func:`convert`.
+
+    Parameters
+    ----------
+
+    path: path-like
+        The path to the PowerPoint presentation to update.
+    slides: path-like, bytes, or file-like
+        The path to or the content of the slides PDF.
+    notes: path-like, bytes, or file-like, optional
+        The path to or the content of the notes PDF.
+    notes_map: sequence of integers or strings, optional
+        The slides to which to assign the notes.
+    kwargs:
+        The remaining keyword arguments of :func:`convert`.
+
+    Returns
+    -------
+
+    pptx.Presentation:
+        The updated presentation.  It is not saved back to ``path``.
+
+    Notes
+    -----
+
+    Only the slides whose page or render settings changed since the
+    presentation was generated are rendered again.  This requires
+    :mod:`pypdf` to fingerprint the pages and fingerprints recorded by a
+    previous update or a conversion with a ``cache``; without them,
+    every slide is replaced.
+
+    """
+    return convert(slides, notes, notes_map, base=path, **kwargs)
+
+
+def convert_to(stream: IO[bytes],
+               slides: _Source,
+               notes: Optional[_Source] = None,
+               notes_map: Sequence[Union[int, str]] = [],
+               on_event: Optional[Callable[[Event], None]] = None,
+               **kwargs: Any,
+               ) -> None:
+    """Convert the presentation and write it to a binary stream.
+
+    Parameters
+    ----------
+
+    stream: file-like
+        The binary file-like object to which to write the ``.pptx``.
+        It does not need to be seekable so it can be a pipe, a socket,
+        or the response body of a web framework.
+    slides: path-like, bytes, or file-like
+        The path to or the content of the slides PDF.
+    notes: path-like, bytes, or file-like, optional
+        The path to or the content of the notes PDF.
+    notes_map: sequence of integers or strings, optional
+        The slides to which to assign the notes.
+    on_event: callable, optional
+        The function to call with an :class:`Event` as each stage of
+        the conversion ends including the final 'save'.
+    kwargs:
+        The remaining keyword arguments of :func:`convert`.
+
+    """
+    pres = convert(slides, notes, notes_map, on_event=on_event, **kwargs)
+    with _span(on_event, "save", path=getattr(stream, "name", None)):
+        pres.save(stream)
+        stream.flush()
+
+
+async def _run_async(command: Sequence[str],
+                     timeout: Optional[float],
+                     logger: logging.Logger,
+                     limiter: Optional[asyncio.Semaphore] = None,
+                     ) -> bytes:
+    """Run a command without blocking the event loop and get its output
+
+    The command waits for ``limiter`` before it starts.  The process is
+    killed when ``timeout`` expires or the task is cancelled.  The
+    errors are raised like :func:`subprocess.run` with ``check=True``
+    would raise them.
+
+    """
+    if limiter is not None:
+        await limiter.acquire()
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(),
+                                                    timeout)
+        except BaseException as err:
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+
+            await proc.wait()
+            if isinstance(err, asyncio.TimeoutError):
+                raise subprocess.TimeoutExpired(
+                    command, cast(float, timeout)
+                ) from None
+
+            raise
+    finally:
+        if limiter is not None:
+            limiter.release()
+
+    if proc.returncode != 0:
+        logger.error(f"Error message: '{stderr.decode(errors='replace')}'")
+        raise subprocess.CalledProcessError(cast(int, proc.returncode),
+                                            command, stdout, stderr)
+
+    return stdout
+
+
+class _LoopRunner(_Runner):
+    """The steps of the conversion pipeline run in an event loop
+
+    The Poppler tools run as subprocesses awaited by the loop within
+    ``limiter`` and the steps parsing or writing in process run on
+    ``executor``, the default executor of the loop if it is not given,
+    one short call at a time.  The tasks spawned by the pipeline are
+    tasks of the loop and cancelling one kills its process.
+
+    """
+
+    name = PopplerBackend.name
+
+    def __init__(self,
+                 limiter: asyncio.Semaphore,
+                 executor: Optional[Executor] = None,
+                 ) -> None:
+        self._limiter = limiter
+        self._executor = executor
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    async def call(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Run a step parsing or writing in process on the executor"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(function, *args)
+        )
+
+    async def probe(self,
+                    path: Union[PathLike, str],
+                    timeout: Optional[float],
+                    ) -> PdfInfo:
+        """Probe the document information (see :func:`probe_pdf_async`)"""
+        return await probe_pdf_async(path, timeout, self._limiter)
+
+    async def notes(self,
+                    path: Union[PathLike, str],
+                    timeout: Optional[float],
+                    ) -> List[str]:
+        """Extract the text of each page (see :func:`extract_notes_async`)"""
+        return await extract_notes_async(path, timeout, self._limiter)
+
+    async def words(self,
+                    path: Union[PathLike, str],
+                    timeout: Optional[float],
+                    first: int,
+                    last: int,
+                    ) -> List[List[Word]]:
+        """Extract the words of the pages (see :func:`extract_words_async`)"""
+        return await extract_words_async(path, timeout, first, last,
+                                         self._limiter)
+
+    async def render(self,
+                     path: Union[PathLike, str],
+                     output: pathlib.Path,
+                     first: Optional[int],
+                     last: Optional[int],
+                     dpi: float,
+                     image_format: str,
+                     quality: int,
+                     width: Optional[int],
+                     timeout: Optional[float],
+                     height: Optional[int],
+                     ) -> None:
+        """Render a range of pages using :manpage:`pdftocairo`"""
+        options = _render_options(dpi, image_format, quality, width, height)
+        logger = logging.getLogger(__name__ + ".extract_slides")
+        stdout = await _run_async(["pdftocairo", *options,
+                                   *_page_options(first, last),
+                                   str(path), str(output)
+                                   ],
+                                  timeout,
+                                  logger,
+                                  self._limiter,
+                                  )
+        if stdout != b"":
+            logger.info(stdout.decode())
+
+    async def gather(self,
+                     steps: Sequence[Callable[[], Awaitable[Any]]],
+                     jobs: int,
+                     ) -> List[Any]:
+        """Run the steps concurrently within the limiter"""
+        tasks = [asyncio.ensure_future(_()) for _ in steps]
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            if tasks:
+                await asyncio.wait(tasks)
+
+    def spawn(self, function: Callable[..., Awaitable[Any]],
+              *args: Any) -> Any:
+        """Start running a coroutine function as a task of the loop"""
+        return asyncio.ensure_future(function(*args))
+
+    async def join(self, task: Any) -> Any:
+        """Wait for a task and get its result"""
+        return await task
+
+    async def drop(self, task: Any) -> Any:
+        """Cancel a task and get its result if it already finished"""
+        task.cancel()
+        await asyncio.wait([task])
+        if task.cancelled() or task.exception() is not None:
+            return None
+
+        return task.result()
+
+
+async def probe_pdf_async(path: _Source,
+                          timeout: Optional[float] = None,
+                          limiter: Optional[asyncio.Semaphore] = None,
+                          ) -> PdfInfo:
+    """Probe the document information of the PDF in an event loop.
+
+    Parameters
+    ----------
+
+    path: path-like, bytes, or file-like
+        The path to or the content of the PDF.
+    timeout: float, optional
+        The time allowed for :manpage:`pdfinfo` to finish.
+    limiter: asyncio.Semaphore, optional
+        The semaphore bounding the number of concurrent processes.
+
+    Returns
+    -------
+
+    PdfInfo:
+        The parsed document information.
+
+    Raises
+    ------
+
+    subprocess.TimeoutError:
+        If the call to :manpage:`pdfinfo` times out.
+    subprocess.CalledProcessError:
+        If the call to :manpage:`pdfinfo` raises an error.
+    RuntimeError:
+        If :manpage:`pdfinfo` does not produce any output.
+
+    Notes
+    -----
+
+    This is the coroutine version of :func:`probe_pdf` with the Poppler
+    backend.  The result can be passed to :func:`extract_aspect_ratio`,
+    :func:`extract_metadata`, and :func:`extract_page_count`.
+
+    """
+    logger = logging.getLogger(__name__ + ".probe_pdf")
+    with _pdf_file(path) as name:
+        output = await _run_async(["pdfinfo", "-f", "1", "-l",
+                                   str(_LAST_PAGE), str(name)
+                                   ],
+                                  timeout,
+                                  logger,
+                                  limiter,
+                                  )
+
+    return _parse_pdfinfo(output.decode(), logger)
+
+
+async def extract_notes_async(path: _Source,
+                              timeout: Optional[float] = None,
+                              limiter: Optional[asyncio.Semaphore] = None,
+                              ) -> List[str]:
+    """Extract the notes from the PDF in an event loop.
+
+    Parameters
+    ----------
+
+    path: path-like, bytes, or file-like
+        The path to or the content of the notes PDF.
+    timeout: float, optional
+        The time allowed for :manpage:`pdftotext` to finish.
+    limiter: asyncio.Semaphore, optional
+        The semaphore bounding the number of concurrent processes.
+
+    Returns
+    -------
+
+    list of str:
+        The text of each note page.
+
+    Raises
+    ------
+
+    subprocess.TimeoutError:
+        If the call to :manpage:`pdftotext` times out.
+    subprocess.CalledProcessError:
+        If the call to :manpage:`pdftotext` raises an error.
+
+    Notes
+    -----
+
+    This is the coroutine version of :func:`extract_notes` with the
+    Poppler backend.
+
+    """
+    logger = logging.getLogger(__name__ + ".extract_notes")
+    with _pdf_file(path) as name:
+        output = await _run_async(["pdftotext", str(name), "-"], timeout,
+                                  logger, limiter)
+
+    text = output.decode().replace("\r\n", "\n").replace("\r", "\n")
+    return text.split("\f")[:-1]
+
+
+async def extract_words_async(path: _Source,
+                              timeout: Optional[float] = None,
+                              first: Optional[int] = None,
+                              last: Optional[int] = None,
+                              limiter: Optional[asyncio.Semaphore] = None,
+                              ) -> List[List[Word]]:
+    """Extract the words and their positions in an event loop.
+
+    Parameters
+    ----------
+
+    path: path-like, bytes, or file-like
+        The path to or the content of the PDF.
+    timeout: float, optional
+        The time allowed for :manpage:`pdftotext` to finish.
+    first: int, optional
+        The first page (one based) to extract.
+    last: int, optional
+        The last page (one based) to extract.
+    limiter: asyncio.Semaphore, optional
+        The semaphore bounding the number of concurrent processes.
+
+    Returns
+    -------
+
+    list of list of Word:
+        The words of each page in reading order.
+
+    Raises
+    ------
+
+    subprocess.TimeoutError:
+        If the call to :manpage:`pdftotext` times out.
+    subprocess.CalledProcessError:
+        If the call to :manpage:`pdftotext` raises an error.
+
+    Notes
+    -----
+
+    This is the coroutine version of :func:`iter_words` with the
+    Poppler backend.
+
+    """
+    logger = logging.getLogger(__name__ + ".iter_words")
+    with _pdf_file(path) as name:
+        output = await _run_async(["pdftotext", "-bbox",
+                                   *_page_options(first, last), str(name),
+                                   "-"
+                                   ],
+                                  timeout, logger, limiter)
+
+    return list(_parse_words(io.BytesIO(output)))
+
+
+async def extract_slides_async(path: _Source,
+                               directory: str = os.curdir,
+                               timeout: Optional[float] = None,
+                               jobs: int = 1,
+                               info: Optional[PdfInfo] = None,
+                               cache: Optional[SlideCache] = None,
+                               dpi: float = 600,
+                               image_format: str = "png",
+                               quality: int = 90,
+                               width: Optional[int] = None,
+                               first: Optional[int] = None,
+                               last: Optional[int] = None,
+                               on_event: Optional[Callable[[Event], None]]
+                               = None,
+                               limiter: Optional[asyncio.Semaphore] = None,
+                               height: Optional[int] = None,
+                               executor: Optional[Executor] = None,
+                               ) -> List[str]:
+    """Extract the slides from the PDF in an event loop.
+
+    Parameters
+    ----------
+
+    path: path-like, bytes, or file-like
+        The path to or the content of the slides PDF.
+    directory: str
+        The path to the output directory in which to write the images.
+    timeout: float, optional
+        The time allowed for each :manpage:`pdftocairo` to finish.
+    jobs: int, optional
+        The number of page ranges to render concurrently.  A value less
+        than one uses all available CPUs.
+    info: PdfInfo, optional
+        The probed information of ``path``.
+    cache: SlideCache, optional
+        The cache from which to reuse the images of unchanged pages.
+    dpi: float, optional
+        The resolution at which to render the slides.
+    image_format: str, optional
+        The image format (see :func:`extract_slides`).
+    quality: int, optional
+        The JPEG quality between 0 and 100.
+    width: int, optional
+        The width in pixels of the images.
+    first: int, optional
+        The first page (one based) to render.
+    last: int, optional
+        The last page (one based) to render.
+    on_event: callable, optional
+        The function to call with the 'render' :class:`Event` of each
+        page when the pages are rendered.
+    limiter: asyncio.Semaphore, optional
+        The semaphore bounding the number of concurrent processes.
+    height: int, optional
+        The height in pixels of the images when ``width`` is given.
+    executor: concurrent.futures.Executor, optional
+        The executor on which to run the work done in process.  The
+        default executor of the loop is used if it is not given.
+
+    Returns
+    -------
+
+    list of str:
+        The path to each created slide file in page order.
+
+    Raises
+    ------
+
+    subprocess.TimeoutError:
+        If a call to :manpage:`pdftocairo` times out.
+    subprocess.CalledProcessError:
+        If a call to :manpage:`pdftocairo` raises an error.
+    ImportError:
+        If ``cache`` is given and :mod:`pypdf` is not installed.
+    ValueError:
+        If the image format is unknown.
+
+    Notes
+    -----
+
+    This is the coroutine version of :func:`extract_slides` with the
+    Poppler backend.  The :manpage:`pdftocairo` processes are awaited
+    by the loop and no thread waits for them.  Fingerprinting the pages
+    for the ``cache``, copying the cached images, and choosing the
+    'auto' formats run as short calls on ``executor``.
+
+    """
+    if limiter is None:
+        limiter = asyncio.Semaphore(max(1, jobs if jobs >= 1
+                                        else os.cpu_count() or 1))
+
+    logger = logging.getLogger(__name__ + ".extract_slides")
+    runner = _LoopRunner(limiter, executor)
+    with _pdf_file(path) as path:
+        images, reused = await _render_pages(
+            runner, path, directory, timeout, jobs, info, cache, dpi,
+            image_format, quality, width, first, last, on_event, height
+        )
+
+    if cache is not None:
+        await runner.call(_close_cache, cache, reused, len(images), logger)
+
+    return images
+
+
+async def convert_async(slides: _Source,
+                        notes: Optional[_Source] = None,
+                        notes_map: Sequence[Union[int, str]] = [],
+                        timeout: Optional[float] = None,
+                        jobs: int = 1,
+                        cache: Optional[SlideCache] = None,
+                        dpi: float = 600,
+                        image_format: str = "png",
+                        quality: int = 90,
+                        display: Optional[Union[str, Tuple[int, int]]] = None,
+                        mode: str = "raster",
+                        window: Optional[int] = None,
+                        base: Optional[Union[PathLike, str]] = None,
+                        overlays: str = "builds",
+                        on_event: Optional[Callable[[Event], None]] = None,
+                        low_memory: bool = False,
+                        limiter: Optional[asyncio.Semaphore] = None,
+                        searchable: bool = False,
+                        links: bool = False,
+                        media: bool = False,
+                        executor: Optional[Executor] = None,
+                        ) -> pptx.Presentation:
+    """Convert the presentation to PowerPoint in an event loop.
+
+    Parameters
+    ----------
+
+    slides: path-like, bytes, or file-like
+        The path to or the content of the slides PDF.
+    notes: path-like, bytes, or file-like, optional
+        The path to or the content of the notes PDF.
+    notes_map: sequence of integers or strings, optional
+        The slides to which to assign the notes.
+    timeout: float, optional
+        The time allowed for each Poppler process to finish.
+    jobs: int, optional
+        The number of concurrent processes when ``limiter`` is not
+        given.  A value less than one uses all available CPUs.
+    limiter: asyncio.Semaphore, optional
+        The semaphore bounding the number of concurrent processes.
+        Sharing it between conversions bounds the processes of all of
+        them.
+    executor: concurrent.futures.Executor, optional
+        The executor on which to run the work done in process.  The
+        default executor of the loop is used if it is not given.
+        Sharing it between conversions bounds the threads of all of
+        them.
+    kwargs:
+        The remaining parameters are those of :func:`convert`.
+
+    Returns
+    -------
+
+    pptx.Presentation:
+        The converted presentation.
+
+    Raises
+    ------
+
+    subprocess.TimeoutError:
+        If a call to one of the subroutines times out.
+    subprocess.CalledProcessError:
+        If a call to one of the subroutines errors.
+    ValueError:
+        If notes_map is not the same length as the notes or refers to an
+        unknown slide or the mode or overlays are unknown.
+
+    Notes
+    -----
+
+    This is the coroutine version of :func:`convert` with the Poppler
+    backend and it runs the same pipeline.  The tools run as subprocesses
+    awaited by the loop within ``limiter`` so no thread waits for them.
+    The work done in process, parsing the PDFs with :mod:`pypdf`,
+    indexing and inserting each slide image, and choosing the 'auto'
+    formats, runs as short calls on ``executor``.  A conversion holds a
+    thread only during such a call so a single thread can serve many
+    conversions.  Cancelling the conversion, for example with
+    :func:`asyncio.wait_for`, kills its processes.
+
+    """
+    if jobs < 1:
+        jobs = os.cpu_count() or 1
+
+    limiter = asyncio.Semaphore(jobs) if limiter is None else limiter
+    referenced = isinstance(slides, (str, PathLike))
+    with contextlib.ExitStack() as stack:
+        slides = stack.enter_context(_pdf_file(slides))
+        if notes is not None:
+            notes = stack.enter_context(_pdf_file(notes))
+
+        return await _convert(
+            _LoopRunner(limiter, executor), slides, notes, notes_map,
+            timeout, jobs, cache, dpi, image_format, quality, display, mode,
+            window, base, overlays, on_event, low_memory, searchable, links,
+            media, referenced
+        )
@@ -1,14 +1,152 @@
 import argparse
+import csv
 import logging
+import os
 import pathlib
+import re
 import sys
 
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import (
+    Any,
+    Callable,
+    List,
+    NamedTuple,
     Sequence,
     Optional,
+    Tuple,
+    Union,
 )
 
-from . import convert
+from . import (
+    BACKENDS,
+    DISPLAYS,
+    IMAGE_FORMATS,
+    MODES,
+    OVERLAYS,
+    Event,
+    SlideCache,
+    Trace,
+    _span,
+    convert,
+    convert_to,
+)
+
+
+class _Deck(NamedTuple):
+    """A presentation to convert"""
+
+    slides: str
+    notes: Optional[str]
+    mapping: Optional[str]
+    output: Optional[pathlib.Path]
+
+
+def _read_map(path: str) -> List[Union[int, str]]:
+    """Read the note mapping listing one slide per line
+
+    Each line is the zero based slide number or 'label:' followed by the
+    page label of the slide.
+
+    """
+    mapping: List[Union[int, str]] = []
+    with open(path) as stream:
+        for line, _ in enumerate(stream, start=1):
+            if _.startswith("label:"):
+                mapping.append(_[len("label:"):].strip())
+                continue
+
+            try:
+                mapping.append(int(_))
+            except ValueError:
+                raise ValueError(f"Could not convert '{_.strip()}' on line "
+                                 f"{line} of '{path}' to an integer or "
+                                 "a 'label:' entry")
+
+    return mapping
+
+
+def _read_manifest(path: str
+                   ) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """Read the presentations listed in a manifest
+
+    Each row of the comma separated manifest is the path to the slides
+    optionally followed by the paths to the notes and the note mapping.
+    Relative paths are relative to the manifest.  Blank lines and lines
+    starting with '#' are skipped.
+
+    """
+    root = pathlib.Path(path).parent
+    entries = []
+    with open(path, newline="") as stream:
+        for row in csv.reader(stream):
+            row = [_.strip() for _ in row]
+            if not row or not row[0] or row[0].startswith("#"):
+                continue
+
+            if len(row) > 3:
+                raise ValueError(f"Too many columns in '{path}' for "
+                                 f"'{row[0]}'")
+
+            slides, notes, mapping = (row + ["", ""])[:3]
+            entries.append((str(root / slides),
+                            str(root / notes) if notes else None,
+                            str(root / mapping) if mapping else None,
+                            ))
+
+    return entries
+
+
+def _convert_deck(deck: _Deck,
+                  pool: Executor,
+                  update: bool = False,
+                  on_event: Optional[Callable[[Event], None]] = None,
+                  **kwargs: Any,
+                  ) -> None:
+    """Convert a single presentation and save the result
+
+    The presentation is read from the standard input when the slides or
+    notes are '-' and written to the standard output when the output is
+    None.
+
+    """
+    mapping = [] if deck.mapping is None else _read_map(deck.mapping)
+    slides = sys.stdin.buffer if deck.slides == "-" else deck.slides
+    notes = sys.stdin.buffer if deck.notes == "-" else deck.notes
+    if deck.output is None:
+        convert_to(sys.stdout.buffer, slides, notes, mapping, pool=pool,
+                   on_event=on_event, **kwargs)
+        return
+
+    base = deck.output if update and deck.output.exists() else None
+    pres = convert(slides, notes, mapping, base=base, pool=pool,
+                   on_event=on_event, **kwargs)
+    with _span(on_event, "save", path=deck.output) as args:
+        pres.save(deck.output)
+        args["bytes"] = deck.output.stat().st_size
+
+
+def _input(value: str) -> str:
+    """Check the path to an input PDF where '-' is the standard input"""
+    if value != "-" and not os.path.isfile(value):
+        raise argparse.ArgumentTypeError(f"can't open '{value}'")
+
+    return value
+
+
+def _display(value: str) -> Union[str, Tuple[int, int]]:
+    """Parse a display given by name or as 'WIDTHxHEIGHT'"""
+    if value in DISPLAYS:
+        return value
+
+    match = re.fullmatch(r"\s*(\d+)\s*[xX]\s*(\d+)\s*", value)
+    if not match:
+        raise argparse.ArgumentTypeError(
+            f"invalid display size '{value}' (expected WIDTHxHEIGHT or "
+            f"one of {', '.join(DISPLAYS)})"
+        )
+
+    return int(match.group(1)), int(match.group(2))
 
 
 def _main(arguments: Optional[Sequence[str]] = None) -> None:
@@ -31,25 +169,97 @@ def _main(arguments: Optional[Sequence[str]] = None) -> None:
         Notes can be inserted into the "Presenter Notes" section of the
         slide by providing a companions notes PDF generated using
         `\\setbeameroption{show only notes}`.  For best results, also
-        use `\\usebeamertheme{note page}[plain]`.  The default mapping
-        of notes to slides is one to one; however, this can be
+        use `\\usebeamertheme{note page}[plain]`.  The mapping of notes
+        to slides is inferred from the page labels or the frame titles
+        when possible and is one to one otherwise; however, this can be
         overridden with the --map option which specifies a file that
-        lists the slide numbers for each slide in the notes file..
+        lists the slide numbers for each slide in the notes file.  A
+        line of the form 'label:LABEL' refers to the slide by its page
+        label instead and several notes pages may share a slide.  Many
+        presentations can be converted in one run by listing several
+        PDFs or a --manifest; they share one pool of rendering
+        processes and the result for each presentation is reported.
         """)
-    parser.add_argument("pdf", type=argparse.FileType("rb"),
-                        help="The path to the presentation to convert")
+    parser.add_argument("pdf", type=_input, nargs="*",
+                        help="The path to the presentations to convert ('-' "
+                        "for the standard input)")
+    parser.add_argument("--backend", choices=list(BACKENDS),
+                        default="poppler",
+                        help="The library or tools with which to read and "
+                        "render the PDFs (default: %(default)s)")
+    parser.add_argument("-c", "--cache",
+                        help="The directory in which to cache the rendered "
+                        "slides between conversions")
+    parser.add_argument("--cache-size", type=float, default=1024,
+                        help="The maximum size of the cache in MiB "
+                        "(default: %(default)s)")
+    parser.add_argument("--decks", type=int, default=1,
+                        help="The number of presentations to convert "
+                        "concurrently (default: %(default)s)")
+    parser.add_argument("-d", "--dpi", type=float, default=600,
+                        help="The resolution at which to render the slides "
+                        "(default: %(default)s)")
+    parser.add_argument("--display", type=_display,
+                        help="Render the slides to fill a display of the "
+                        "given WIDTHxHEIGHT in pixels or named "
+                        f"{', '.join(DISPLAYS)} instead of at --dpi")
+    parser.add_argument("-f", "--format", choices=IMAGE_FORMATS,
+                        default="png",
+                        help="The slide image format where 'auto' picks the "
+                        "smaller of PNG and JPEG for each slide "
+                        "(default: %(default)s)")
     parser.add_argument("-i", "--interactive", action="store_true",
                         help="Ask before overwriting an existing file")
-    parser.add_argument("-m", "--map", type=argparse.FileType("r"),
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="The number of concurrent rendering processes "
+                        "(0 uses all available CPUs)")
+    parser.add_argument("-l", "--links", action="store_true",
+                        help="Make the links and navigation symbols of the "
+                        "slides clickable (requires pypdf)")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="Keep the slide images on disk until the "
+                        "presentation is saved instead of in memory")
+    parser.add_argument("-m", "--map",
                         help="The path to the note mapping")
-    parser.add_argument("-n", "--notes", type=argparse.FileType("rb"),
-                        help="The path to the presentation notes")
+    parser.add_argument("--manifest",
+                        help="The path to a CSV file listing the slides, "
+                        "notes, and note mapping of presentations to "
+                        "convert")
+    parser.add_argument("--media", action="store_true",
+                        help="Play the movies of the slides in the "
+                        "presentation (requires pypdf)")
+    parser.add_argument("--mode", choices=MODES, default="raster",
+                        help="Embed the slides as images or as vector "
+                        "graphics with an image fallback "
+                        "(default: %(default)s)")
+    parser.add_argument("-n", "--notes", type=_input,
+                        help="The path to the presentation notes ('-' for "
+                        "the standard input)")
     parser.add_argument("-o", "--output",
-                        help="The path to the output PowerPoint file.")
+                        help="The path to the output PowerPoint file ('-' "
+                        "for the standard output) or the output directory "
+                        "when converting several presentations")
+    parser.add_argument("--overlays", choices=OVERLAYS, default="builds",
+                        help="Create a slide for every overlay of a frame "
+                        "or only for the last one (default: %(default)s)")
+    parser.add_argument("--profile",
+                        help="Write the timing of each conversion stage to "
+                        "this Chrome trace JSON file and print a summary")
+    parser.add_argument("-q", "--quality", type=int, default=90,
+                        help="The JPEG quality (default: %(default)s)")
+    parser.add_argument("-s", "--searchable", action="store_true",
+                        help="Lay invisible native text boxes over the "
+                        "slide images so their text can be searched")
+    parser.add_argument("-u", "--update", action="store_true",
+                        help="Update an existing output file replacing only "
+                        "the slides that changed")
     parser.add_argument("-v", "--verbose", action="count",
                         help="Increase the verbosity level")
+    parser.add_argument("-w", "--window", type=int,
+                        help="The maximum number of rendered slides waiting "
+                        "to be inserted (default: 16 times --jobs)")
 
-    args = parser.parse_args()
+    args = parser.parse_args(arguments)
 
     levels = {1: logging.INFO, 2: logging.DEBUG}
     if args.verbose is not None and args.verbose not in levels:
@@ -65,36 +275,120 @@ def _main(arguments: Optional[Sequence[str]] = None) -> None:
     handler.setFormatter(logging.Formatter("%(levelname)s:%(message)s"))
     logger.addHandler(handler)
 
-    # Preemptively close the files to avoid conflicts with multiple open
-    # file handles (main for Windows).
-    args.pdf.close()
-    if args.notes is not None:
-        args.notes.close()
-
-    output = pathlib.Path(args.pdf).with_suffix(".pptx") \
-        if args.output is None else pathlib.Path(args.output)
-
-    if args.interactive and output.exists():
-        while True:
-            overwrite = input(f"File '{output}' exits. Overwrite [Yn]? ")
-            if overwrite.lower().startswith("y") or overwrite == "":
-                break
-            elif overwrite.lower().startswith("n"):
-                sys.exit(1)
+    entries: List[Tuple[str, Optional[str], Optional[str]]] = \
+        [(_, None, None) for _ in args.pdf]
+    if len(entries) == 1:
+        entries = [(args.pdf[0], args.notes, args.map)]
+    elif args.notes is not None or args.map is not None:
+        parser.error("--notes and --map require a single presentation")
+
+    if args.manifest is not None:
+        try:
+            entries.extend(_read_manifest(args.manifest))
+        except (OSError, ValueError) as err:
+            sys.exit(str(err))
+
+    if not entries:
+        parser.error("no presentations to convert")
+
+    batch = len(entries) > 1 or args.manifest is not None
+    stdin = [_ for _ in entries[0][:2] if _ == "-"]
+    if stdin and (batch or len(stdin) > 1):
+        parser.error("- requires a single presentation and can only be "
+                     "given once")
+
+    stdout = args.output == "-" \
+        or (args.output is None and entries[0][0] == "-")
+    if stdout and (batch or args.update):
+        parser.error("--output - requires a single presentation and no "
+                     "--update")
+
+    directory = None if not batch or args.output is None \
+        else pathlib.Path(args.output)
+    if directory is not None:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    decks = []
+    for slides, notes, mapping in entries:
+        if stdout:
+            decks.append(_Deck(slides, notes, mapping, None))
+            continue
+
+        if directory is not None:
+            output = directory.joinpath(pathlib.Path(slides).stem + ".pptx")
+        elif batch or args.output is None:
+            output = pathlib.Path(slides).with_suffix(".pptx")
+        else:
+            output = pathlib.Path(args.output)
+
+        if args.interactive and not args.update and output.exists():
+            while True:
+                overwrite = input(f"File '{output}' exits. Overwrite [Yn]? ")
+                if overwrite.lower().startswith("y") or overwrite == "":
+                    decks.append(_Deck(slides, notes, mapping, output))
+                    break
+                elif overwrite.lower().startswith("n"):
+                    break
+                else:
+                    print(f"Invalid selection {overwrite}")
+        else:
+            decks.append(_Deck(slides, notes, mapping, output))
+
+    if not decks:
+        sys.exit(1)
+
+    cache = None if args.cache is None \
+        else SlideCache(args.cache, int(args.cache_size * 2 ** 20))
+
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    trace = None if args.profile is None else Trace()
+    failures = 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool, \
+            ThreadPoolExecutor(max_workers=max(1, args.decks)) as decks_pool:
+        futures = [decks_pool.submit(_convert_deck, deck, pool,
+                                     jobs=jobs,
+                                     cache=cache,
+                                     dpi=args.dpi,
+                                     image_format=args.format,
+                                     quality=args.quality,
+                                     display=args.display,
+                                     mode=args.mode,
+                                     window=args.window,
+                                     update=args.update,
+                                     overlays=args.overlays,
+                                     backend=args.backend,
+                                     on_event=trace,
+                                     low_memory=args.low_memory,
+                                     searchable=args.searchable,
+                                     links=args.links,
+                                     media=args.media,
+                                     )
+                   for deck in decks]
+        for deck, future in zip(decks, futures):
+            error = future.exception()
+            if error is None:
+                logger.info(f"Converted '{deck.slides}' to "
+                            f"'{deck.output or '-'}'")
+                if batch:
+                    print(f"ok: {deck.slides} -> {deck.output}")
+
+                continue
+
+            failures += 1
+            logger.debug(f"Failed to convert '{deck.slides}'",
+                         exc_info=error)
+            if batch:
+                print(f"failed: {deck.slides}: {error}")
             else:
-                print(f"Invalid selection {overwrite}")
+                logger.error(f"Failed to convert '{deck.slides}': {error}")
 
-    mapping = []
-    if args.map is not None:
-        for line, _ in enumerate(args.map, start=1):
-            try:
-                mapping.append(int(_))
-            except ValueError:
-                sys.exit(f"Could not convert '{_}' on line {line} to "
-                         "an integer")
-
-    pres = convert(args.pdf.name,
-                   args.notes if args.notes is None else args.notes.name,
-                   mapping,
-                   )
-    pres.save(output)
+    if trace is not None:
+        trace.write(args.profile)
+        for stage, (count, seconds) in sorted(trace.summary().items(),
+                                              key=lambda _: -_[1][1]):
+            print(f"{stage}: {seconds:.3f} s in {count} calls",
+                  file=sys.stderr)
+
+    if failures:
+        sys.exit(f"Failed to convert {failures} of {len(decks)} "
+                 "presentations")
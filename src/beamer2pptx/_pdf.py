@@ -0,0 +1,317 @@
+"""
+Helpers for inspecting the structure of a PDF in process.
+
+These rely on the optional :mod:`pypdf` dependency which can be
+installed with the ``pdf`` extra.
+"""
+
+import hashlib
+import logging
+import pathlib
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from os import PathLike
+
+
+def open_pdf(path: Union[PathLike, str]) -> Any:
+    """Open the PDF with :class:`pypdf.PdfReader`.
+
+    Raises
+    ------
+
+    ImportError:
+        If :mod:`pypdf` is not installed.
+
+    """
+    try:
+        import pypdf
+    except ImportError as err:
+        logger = logging.getLogger(__name__ + ".open_pdf")
+        raise ImportError(
+            f"'{logger.name}' requires pypdf (install beamer2pptx[pdf])"
+        ) from err
+
+    return pypdf.PdfReader(str(path))
+
+
+def _digest(obj: Any,
+            memo: Dict[int, bytes],
+            active: Set[int],
+            ) -> bytes:
+    """Compute the digest of a PDF object and everything it references.
+
+    Indirect objects are hashed once per document using ``memo``.
+    References to other pages and back references to parents are not
+    followed so each page only depends on its own content.
+
+    """
+    from pypdf.generic import (
+        ArrayObject,
+        DictionaryObject,
+        IndirectObject,
+        StreamObject,
+    )
+
+    if isinstance(obj, IndirectObject):
+        if obj.idnum in memo:
+            return memo[obj.idnum]
+
+        if obj.idnum in active:
+            return b"cycle"
+
+        active.add(obj.idnum)
+        target = obj.get_object()
+        if isinstance(target, DictionaryObject) \
+                and target.get("/Type") in ("/Page", "/Pages"):
+            digest = b"page"
+        else:
+            digest = _digest(target, memo, active)
+
+        active.discard(obj.idnum)
+        memo[obj.idnum] = digest
+        return digest
+
+    sha = hashlib.sha256()
+    sha.update(type(obj).__name__.encode())
+    if isinstance(obj, DictionaryObject):
+        for key in sorted(obj):
+            if key in ("/Parent", "/P"):
+                continue
+
+            sha.update(key.encode())
+            sha.update(_digest(obj.raw_get(key), memo, active))
+
+        if isinstance(obj, StreamObject):
+            sha.update(obj.get_data())
+    elif isinstance(obj, ArrayObject):
+        for item in obj:
+            sha.update(_digest(item, memo, active))
+    else:
+        sha.update(repr(obj).encode())
+
+    return sha.digest()
+
+
+def page_fingerprints(path: Union[PathLike, str]) -> List[str]:
+    """Compute a fingerprint for the content of each page.
+
+    The fingerprint covers the page dictionary, its content streams,
+    resources, and annotations so it only changes when the rendering of
+    the page could change.  It does not depend on the rest of the
+    document such as the creation date or the document ID.
+
+    """
+    reader = open_pdf(path)
+    memo: Dict[int, bytes] = {}
+    return [_digest(page, memo, set()).hex() for page in reader.pages]
+
+
+def page_labels(path: Union[PathLike, str]) -> List[str]:
+    """Get the label of each page
+
+    Pages without a label from the ``/PageLabels`` tree are labeled with
+    their one based page number.
+
+    """
+    return list(open_pdf(path).page_labels)
+
+
+def has_page_labels(path: Union[PathLike, str]) -> bool:
+    """Check if the document defines a ``/PageLabels`` tree"""
+    return "/PageLabels" in open_pdf(path).trailer["/Root"]
+
+
+_PAGE_ACTIONS = {
+    "/FirstPage": lambda page, pages: 0,
+    "/LastPage": lambda page, pages: pages - 1,
+    "/NextPage": lambda page, pages: page + 1,
+    "/PrevPage": lambda page, pages: page - 1,
+}
+"""The named actions going to a page and the index of that page."""
+
+
+def page_links(path: Union[PathLike, str],
+               ) -> List[List[Tuple[Union[int, str],
+                                    float, float, float, float]]]:
+    """Get the targets of the link annotations of each page
+
+    The target is the zero based index of the page for internal links
+    and the URI for external ones.  The boxes are in points from the top
+    left corner of the crop box of the page.  Links to other documents
+    or to unknown destinations are skipped.
+
+    """
+    reader = open_pdf(path)
+    numbers = {page.indirect_reference.idnum: index
+               for index, page in enumerate(reader.pages)
+               if page.indirect_reference is not None}
+    named = reader.named_destinations
+    links = []
+    for index, page in enumerate(reader.pages):
+        box = page.cropbox
+        found = []
+        for annot in page.get("/Annots") or []:
+            annot = annot.get_object()
+            if annot.get("/Subtype") != "/Link" or "/Rect" not in annot:
+                continue
+
+            target = _link_target(annot, index, len(reader.pages), numbers,
+                                  named)
+            if target is None:
+                continue
+
+            x0, y0, x1, y1 = (float(_) for _ in annot["/Rect"])
+            found.append((target,
+                          min(x0, x1) - float(box.left),
+                          float(box.top) - max(y0, y1),
+                          max(x0, x1) - float(box.left),
+                          float(box.top) - min(y0, y1)))
+
+        links.append(found)
+
+    return links
+
+
+def _link_target(annot: Any,
+                 index: int,
+                 pages: int,
+                 numbers: Dict[int, int],
+                 named: Dict[str, Any],
+                 ) -> Optional[Union[int, str]]:
+    """Resolve the page index or URI targeted by a link annotation"""
+    action = annot.get("/A")
+    dest = annot.get("/Dest")
+    if action is not None:
+        action = action.get_object()
+        kind = action.get("/S")
+        if kind == "/URI":
+            return str(action.get("/URI"))
+
+        if kind == "/Named" and action.get("/N") in _PAGE_ACTIONS:
+            target = _PAGE_ACTIONS[action["/N"]](index, pages)
+            return target if 0 <= target < pages else None
+
+        if kind != "/GoTo":
+            return None
+
+        dest = action.get("/D")
+
+    if dest is None:
+        return None
+
+    dest = dest.get_object()
+    if isinstance(dest, str):
+        if dest not in named:
+            return None
+
+        dest = [named[dest].page]
+    elif hasattr(dest, "get") and "/D" in dest:
+        dest = dest["/D"]
+
+    if len(dest) == 0:
+        return None
+
+    page = dest[0]
+    if isinstance(page, int):
+        return page if 0 <= page < pages else None
+
+    return numbers.get(page.idnum) if hasattr(page, "idnum") else None
+
+
+def page_media(path: Union[PathLike, str],
+               directory: Union[PathLike, str],
+               referenced: bool = True,
+               ) -> List[List[Tuple[str, float, float, float, float]]]:
+    """Get the media files played by the annotations of each page
+
+    The movie annotations and the screen annotations with a rendition
+    action are read.  Embedded files are written to ``directory``.  With
+    ``referenced``, the files referenced by a relative name inside the
+    directory of the PDF are resolved there.  Other references are
+    skipped so a PDF cannot point at arbitrary files.  The boxes are in
+    points from the top left corner of the crop box of the page.
+
+    """
+    logger = logging.getLogger(__name__ + ".page_media")
+    reader = open_pdf(path)
+    output = pathlib.Path(directory)
+    base = pathlib.Path(path).parent.resolve()
+    media = []
+    for index, page in enumerate(reader.pages):
+        box = page.cropbox
+        found: List[Tuple[str, float, float, float, float]] = []
+        for annot in page.get("/Annots") or []:
+            annot = annot.get_object()
+            if "/Rect" not in annot:
+                continue
+
+            spec = None
+            if annot.get("/Subtype") == "/Movie" and "/Movie" in annot:
+                spec = annot["/Movie"].get_object().get("/F")
+            elif annot.get("/Subtype") == "/Screen" and "/A" in annot:
+                action = annot["/A"].get_object()
+                if action.get("/S") == "/Rendition" and "/R" in action:
+                    clip = action["/R"].get_object().get("/C")
+                    spec = None if clip is None \
+                        else clip.get_object().get("/D")
+
+            if spec is None:
+                continue
+
+            name, data = _file_spec(spec)
+            if not name and data is None:
+                continue
+
+            if data is None:
+                if not referenced:
+                    logger.warning(f"Skipping the referenced media '{name}' "
+                                   f"on page {index + 1}")
+                    continue
+
+                media_path = base.joinpath(name).resolve()
+                if pathlib.PurePath(name).is_absolute() \
+                        or base not in media_path.parents:
+                    logger.warning(f"Skipping the media '{name}' outside "
+                                   f"of '{base}' on page {index + 1}")
+                    continue
+            else:
+                media_path = output.joinpath(
+                    f"media-{index + 1}-{len(found) + 1}"
+                    f"{pathlib.PurePath(name).suffix}"
+                )
+                media_path.write_bytes(data)
+
+            x0, y0, x1, y1 = (float(_) for _ in annot["/Rect"])
+            found.append((str(media_path),
+                          min(x0, x1) - float(box.left),
+                          float(box.top) - max(y0, y1),
+                          max(x0, x1) - float(box.left),
+                          float(box.top) - min(y0, y1)))
+
+        media.append(found)
+
+    return media
+
+
+def _file_spec(spec: Any) -> Tuple[str, Optional[bytes]]:
+    """Get the file name and the embedded content of a file specification"""
+    spec = spec.get_object()
+    if isinstance(spec, str):
+        return spec, None
+
+    name = str(spec.get("/UF", spec.get("/F", "")))
+    embedded = spec.get("/EF")
+    if embedded is None:
+        return name, None
+
+    embedded = embedded.get_object()
+    stream = embedded.get("/UF", embedded.get("/F"))
+    return name, None if stream is None else stream.get_object().get_data()
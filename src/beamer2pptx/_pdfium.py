@@ -0,0 +1,162 @@
+"""
+Helpers for reading and rendering a PDF in process.
+
+These rely on the optional :mod:`pypdfium2` dependency which can be
+installed with the ``pdfium`` extra.  PDFium is not thread safe so every
+call into it must hold :data:`LOCK`.
+"""
+
+import logging
+import threading
+
+from PIL import Image
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from os import PathLike
+
+LOCK = threading.RLock()
+"""The lock serializing the calls into PDFium."""
+
+
+def open_document(path: Union[PathLike, str]) -> Any:
+    """Open the PDF with :class:`pypdfium2.PdfDocument`.
+
+    Raises
+    ------
+
+    ImportError:
+        If :mod:`pypdfium2` is not installed.
+
+    """
+    try:
+        import pypdfium2
+    except ImportError as err:
+        logger = logging.getLogger(__name__ + ".open_document")
+        raise ImportError(
+            f"'{logger.name}' requires pypdfium2 (install "
+            "beamer2pptx[pdfium])"
+        ) from err
+
+    with LOCK:
+        return pypdfium2.PdfDocument(str(path))
+
+
+def metadata(document: Any) -> Dict[str, str]:
+    """Get the entries of the document information dictionary"""
+    with LOCK:
+        return document.get_metadata_dict()
+
+
+def page_count(document: Any) -> int:
+    """Get the number of pages"""
+    with LOCK:
+        return len(document)
+
+
+def page_sizes(document: Any) -> List[Tuple[float, float]]:
+    """Get the width and height in points of each page"""
+    with LOCK:
+        return [document.get_page_size(_) for _ in range(len(document))]
+
+
+def page_text(document: Any, index: int) -> str:
+    """Get the text of a page with newlines separating the lines"""
+    with LOCK:
+        page = document[index]
+        try:
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_range()
+            finally:
+                textpage.close()
+        finally:
+            page.close()
+
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def page_words(document: Any,
+               index: int,
+               ) -> List[Tuple[str, float, float, float, float]]:
+    """Get the words of a page and their boxes from the top left corner"""
+    words: List[Tuple[str, float, float, float, float]] = []
+    with LOCK:
+        page = document[index]
+        try:
+            height = page.get_height()
+            textpage = page.get_textpage()
+            try:
+                word = ""
+                box = (0.0, 0.0, 0.0, 0.0)
+                for char in range(textpage.count_chars()):
+                    text = textpage.get_text_range(char, 1)
+                    if text.isspace() or text == "":
+                        if word:
+                            words.append((word, *box))
+                            word = ""
+
+                        continue
+
+                    left, bottom, right, top = textpage.get_charbox(char)
+                    if word:
+                        box = (min(box[0], left), min(box[1], height - top),
+                               max(box[2], right),
+                               max(box[3], height - bottom))
+                    else:
+                        box = (left, height - top, right, height - bottom)
+
+                    word += text
+
+                if word:
+                    words.append((word, *box))
+            finally:
+                textpage.close()
+        finally:
+            page.close()
+
+    return words
+
+
+def render_page(document: Any,
+                index: int,
+                dpi: float = 600,
+                width: Optional[int] = None,
+                transparent: bool = False,
+                height: Optional[int] = None,
+                ) -> Image.Image:
+    """Render a page at ``dpi`` or scaled to ``width`` pixels
+
+    When ``height`` is also given the image is resized to exactly
+    ``width`` by ``height`` pixels.
+
+    The image is copied out of the PDFium bitmap so it can be encoded
+    without holding the lock.
+
+    """
+    fill = (255, 255, 255, 0) if transparent else (255, 255, 255, 255)
+    with LOCK:
+        page = document[index]
+        try:
+            scale = dpi / 72 if width is None else width / page.get_width()
+            bitmap = page.render(scale=scale, fill_color=fill)
+            try:
+                image = bitmap.to_pil().copy()
+            finally:
+                bitmap.close()
+        finally:
+            page.close()
+
+    if width is not None and height is None:
+        height = round(image.height * width / image.width)
+
+    if width is not None and image.size != (width, height):
+        image = image.resize((width, height))
+
+    return image
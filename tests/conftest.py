@@ -109,3 +109,101 @@ def pdf_inputs(pdf_dir, author, title, note_texts, tex_inputs):
         logger.error(proc.stderr)
 
     yield [_.with_suffix(".pdf") for _ in tex_inputs]
+
+
+@pytest.fixture
+def media_pdf(tmp_path):
+    """A PDF with a referenced movie and an embedded one"""
+    pypdf = pytest.importorskip("pypdf")
+    from pypdf.generic import (
+        ArrayObject,
+        DecodedStreamObject,
+        DictionaryObject,
+        FloatObject,
+        NameObject,
+        TextStringObject,
+    )
+
+    def dictionary(**entries):
+        return DictionaryObject({NameObject(f"/{key}"): value
+                                 for key, value in entries.items()})
+
+    def rect(*values):
+        return ArrayObject(FloatObject(_) for _ in values)
+
+    writer = pypdf.PdfWriter()
+    writer.add_blank_page(400, 300)
+    writer.add_blank_page(400, 300)
+    tmp_path.joinpath("clip.mp4").write_bytes(b"referenced")
+    writer.add_annotation(0, dictionary(
+        Type=NameObject("/Annot"), Subtype=NameObject("/Movie"),
+        Rect=rect(100, 100, 300, 250),
+        Movie=dictionary(F=TextStringObject("clip.mp4")),
+    ))
+    writer.add_annotation(0, dictionary(
+        Type=NameObject("/Annot"), Subtype=NameObject("/Movie"),
+        Rect=rect(0, 0, 10, 10),
+        Movie=dictionary(F=TextStringObject("missing.mp4")),
+    ))
+    stream = DecodedStreamObject()
+    stream.set_data(b"embedded")
+    writer.add_annotation(1, dictionary(
+        Type=NameObject("/Annot"), Subtype=NameObject("/Screen"),
+        Rect=rect(50, 60, 150, 160),
+        A=dictionary(
+            S=NameObject("/Rendition"),
+            R=dictionary(
+                S=NameObject("/MR"),
+                C=dictionary(
+                    S=NameObject("/MCD"),
+                    D=dictionary(
+                        Type=NameObject("/Filespec"),
+                        UF=TextStringObject("talk.webm"),
+                        EF=dictionary(F=writer._add_object(stream)),
+                    ),
+                ),
+            ),
+        ),
+    ))
+    path = tmp_path.joinpath("media.pdf")
+    writer.write(path)
+    return path
+
+
+@pytest.fixture
+def text_pdf(tmp_path):
+    """A factory of PDFs showing a line of text on each page"""
+    pypdf = pytest.importorskip("pypdf")
+    from pypdf.generic import (
+        DecodedStreamObject,
+        DictionaryObject,
+        NameObject,
+    )
+
+    def write(name, texts, labels=()):
+        writer = pypdf.PdfWriter()
+        font = writer._add_object(DictionaryObject({
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }))
+        for text in texts:
+            page = writer.add_blank_page(400, 300)
+            stream = DecodedStreamObject()
+            stream.set_data(f"BT /F1 36 Tf 40 140 Td ({text}) Tj ET"
+                            .encode())
+            page[NameObject("/Contents")] = writer._add_object(stream)
+            page[NameObject("/Resources")] = DictionaryObject({
+                NameObject("/Font"): DictionaryObject({
+                    NameObject("/F1"): font,
+                }),
+            })
+
+        for index, label in enumerate(labels):
+            writer.set_page_label(index, index, style="/D", start=label)
+
+        path = tmp_path.joinpath(name)
+        writer.write(path)
+        return path
+
+    return write
@@ -1,3 +1,11 @@
+import asyncio
+import concurrent.futures
+import gc
+import io
+import json
+import pathlib
+
+import pptx
 import pytest
 
 import beamer2pptx
@@ -20,8 +28,16 @@ def test_convert_notes(pdf_inputs, aspect_ratio):
     pres = beamer2pptx.convert(slides, notes)
     notes_text = beamer2pptx.extract_notes(notes)
     assert len(pres.slides) == 3
-    assert all(slide.notes_slide.notes_text_frame.text == text
-               for slide, text in zip(pres.slides, notes_text + [""]))
+    try:
+        inferred = beamer2pptx.infer_notes_map(slides, notes)
+    except ImportError:
+        expected = notes_text + [""]
+    else:
+        assert inferred == ["2", "3"]
+        expected = [""] + notes_text
+
+    assert [_.notes_slide.notes_text_frame.text for _ in pres.slides] \
+        == expected
 
     pres = beamer2pptx.convert(slides, notes, notes_map=[1, 2])
     assert all(slide.notes_slide.notes_text_frame.text == text
@@ -34,3 +50,390 @@ def test_convert_notes(pdf_inputs, aspect_ratio):
 
     with pytest.raises(ValueError):
         beamer2pptx.convert(slides, notes, notes_map=[1])
+
+    with pytest.raises(ValueError):
+        beamer2pptx.convert(slides, notes, notes_map=[1, 3])
+
+    pres = beamer2pptx.convert(slides, notes, notes_map=[2, 2])
+    assert pres.slides[2].notes_slide.notes_text_frame.text == \
+        "\n".join(notes_text)
+
+
+def test_convert_notes_labels(pdf_inputs):
+    """Check assigning the notes by the page labels of the slides"""
+    pytest.importorskip("pypdf")
+    slides, notes = pdf_inputs
+    notes_text = beamer2pptx.extract_notes(notes)
+    pres = beamer2pptx.convert(slides, notes, notes_map=["3", 1])
+    assert all(slide.notes_slide.notes_text_frame.text == text
+               for slide, text in zip(pres.slides,
+                                      [""] + notes_text[::-1]))
+
+    with pytest.raises(ValueError):
+        beamer2pptx.convert(slides, notes, notes_map=["3", "4"])
+
+    with pytest.raises(ValueError):
+        beamer2pptx._notes_index(["1"], [1, 2, 3], ["1", "2", "1"])
+
+    assert beamer2pptx._notes_index(["2"], [1, 2, 3], ["1", "2", "2"]) == \
+        {2: [0]}
+
+
+def test_infer_notes_map(pdf_inputs, tmp_path):
+    """Check inferring the notes mapping from the page labels"""
+    pypdf = pytest.importorskip("pypdf")
+    slides, notes = pdf_inputs
+    writer = pypdf.PdfWriter(clone_from=str(notes))
+    writer.set_page_label(0, 1, style="/D", start=2)
+    labeled = tmp_path.joinpath("labeled.pdf")
+    writer.write(labeled)
+    assert beamer2pptx.infer_notes_map(slides, labeled) == ["2", "3"]
+
+    notes_text = beamer2pptx.extract_notes(labeled)
+    pres = beamer2pptx.convert(slides, labeled)
+    assert [_.notes_slide.notes_text_frame.text for _ in pres.slides] == \
+        [""] + notes_text
+
+
+def test_convert_display(pdf_inputs, aspect_ratio):
+    """Check the conversion for a target display"""
+    slides, _ = pdf_inputs
+    pres = beamer2pptx.convert(slides, image_format="jpeg",
+                               display=(1920, 1080))
+    assert len(pres.slides) == 3
+    width, _ = beamer2pptx.slide_pixels(aspect_ratio, (1920, 1080))
+    for slide in pres.slides:
+        picture, = slide.shapes
+        assert picture.image.content_type == "image/jpeg"
+        assert picture.image.size[0] == width
+
+
+def test_convert_display_name(pdf_inputs, aspect_ratio):
+    """Check the conversion to the exact pixels of a named display"""
+    slides, _ = pdf_inputs
+    pres = beamer2pptx.convert(slides, display="1080p")
+    pixels = beamer2pptx.slide_pixels(aspect_ratio,
+                                      beamer2pptx.DISPLAYS["1080p"])
+    for slide in pres.slides:
+        picture, = slide.shapes
+        assert picture.image.size == pixels
+
+    with pytest.raises(ValueError):
+        beamer2pptx.convert(slides, display="cinema")
+
+
+def test_convert_vector(pdf_inputs):
+    """Check the conversion embedding vector slides"""
+    slides, _ = pdf_inputs
+    pres = beamer2pptx.convert(slides, mode="vector")
+    assert len(pres.slides) == 3
+    for slide in pres.slides:
+        picture, = slide.shapes
+        assert picture.image.content_type == "image/png"
+        assert any(_.reltype.endswith("/image")
+                   and _.target_part.content_type == "image/svg+xml"
+                   for _ in slide.part.rels.values())
+
+    with pytest.raises(ValueError):
+        beamer2pptx.convert(slides, mode="emf")
+
+
+def test_update(pdf_inputs, tmp_path):
+    """Check updating a previous conversion"""
+    pytest.importorskip("pypdf")
+    slides, notes = pdf_inputs
+    output = tmp_path / "presentation.pptx"
+    beamer2pptx.convert(slides).save(output)
+    blobs = [slide.shapes[0].image.blob
+             for slide in pptx.Presentation(output).slides]
+    assert beamer2pptx._read_fingerprints(pptx.Presentation(output)) == []
+
+    pres = beamer2pptx.update(output, slides, notes)
+    assert len(pres.slides) == 3
+    assert [slide.shapes[0].image.blob for slide in pres.slides] == blobs
+    notes_text = beamer2pptx.extract_notes(notes)
+    assert [_.notes_slide.notes_text_frame.text for _ in pres.slides] \
+        == [""] + notes_text
+
+    pres.save(output)
+    names = []
+    pres = beamer2pptx.update(output, slides, notes,
+                              on_event=lambda _: names.append(_.name))
+    assert "fingerprints" in names and "render" not in names
+    assert [slide.shapes[0].image.blob for slide in pres.slides] == blobs
+
+    pres = beamer2pptx.update(output, slides, image_format="jpeg")
+    assert all(slide.shapes[0].image.content_type == "image/jpeg"
+               for slide in pres.slides)
+
+
+def test_convert_duplicates(pdf_inputs, tmp_path):
+    """Check identical slide images share one image part"""
+    slides, _ = pdf_inputs
+    images = beamer2pptx.extract_slides(slides, tmp_path)
+    index = beamer2pptx._ImageIndex(pptx.Presentation())
+    parts = [index.get(_) for _ in images + images[:1]]
+    assert parts[0] is parts[-1]
+    assert len({id(_) for _ in parts}) == 3
+    assert (index.added, index.reused) == (3, 1)
+
+
+def test_convert_shared_images(text_pdf, tmp_path):
+    """Check the slides rendering the same share one image part"""
+    slides = text_pdf("slides.pdf", ["Title", "A", "Title", "B", "A", "C",
+                                     "Title"])
+    output = tmp_path.joinpath("output.pptx")
+    beamer2pptx.convert(slides, dpi=72).save(output)
+    pres = pptx.Presentation(output)
+    parts = {_.part.related_part(_.shapes[0]._element.blip_rId)
+             for _ in pres.slides}
+    images = [_ for _ in pres.part.package.iter_parts()
+              if _.partname.startswith("/ppt/media/")]
+    assert len(pres.slides) == 7
+    assert len(parts) == len(images) == 4
+
+
+def test_convert_overlays(text_pdf):
+    """Check collapsing the overlays of each frame"""
+    slides = text_pdf("slides.pdf", ["Frame 1", "Frame 2a", "Frame 2b",
+                                     "Frame 3"], [1, 2, 2, 3])
+    notes = text_pdf("notes.pdf", ["Note 1", "Note 2", "Note 3"],
+                     [1, 2, 3])
+    notes_text = beamer2pptx.extract_notes(notes)
+    assert [_.strip() for _ in notes_text] == ["Note 1", "Note 2", "Note 3"]
+    builds = beamer2pptx.convert(slides, notes, dpi=72)
+    assert len(builds.slides) == 4
+    assert [_.notes_slide.notes_text_frame.text for _ in builds.slides] \
+        == [notes_text[0], "", *notes_text[1:]]
+
+    pres = beamer2pptx.convert(slides, notes, dpi=72, overlays="last")
+    assert len(pres.slides) == 3
+    assert [_.shapes[0].image.blob for _ in pres.slides] \
+        == [builds.slides[_].shapes[0].image.blob for _ in (0, 2, 3)]
+    assert builds.slides[1].shapes[0].image.blob \
+        != builds.slides[2].shapes[0].image.blob
+    assert [_.notes_slide.notes_text_frame.text for _ in pres.slides] \
+        == notes_text
+
+    with pytest.raises(ValueError):
+        beamer2pptx.convert(slides, overlays="first")
+
+
+def test_convert_backend(pdf_inputs, aspect_ratio):
+    """Check the conversion with the in-process backend"""
+    pytest.importorskip("pypdfium2")
+    slides, notes = pdf_inputs
+    pres = beamer2pptx.convert(slides, notes, backend="pdfium")
+    assert len(pres.slides) == 3
+    width, height = beamer2pptx.ASPECT_RATIOS[aspect_ratio]
+    assert (pres.slide_width, pres.slide_height) == (width, height)
+    assert pres.slides[1].notes_slide.notes_text_frame.text != ""
+
+
+def test_convert_events(pdf_inputs, tmp_path):
+    """Check the stages of the conversion are reported"""
+    slides, notes = pdf_inputs
+    trace = beamer2pptx.Trace()
+    beamer2pptx.convert(slides, notes, jobs=2, on_event=trace)
+    names = [_.name for _ in trace.events]
+    assert names[-1] == "convert"
+    assert {"probe", "notes"} <= set(names)
+    assert "fingerprints" not in names
+    assert names.count("render") == 3
+    assert sorted(_.args["page"] for _ in trace.events
+                  if _.name == "render") == [1, 2, 3]
+    assert names.count("insert") == 3
+    assert all(_.start <= _.end for _ in trace.events)
+    assert trace.summary()["render"][0] == 3
+
+    output = tmp_path.joinpath("trace.json")
+    trace.write(output)
+    events = json.loads(output.read_text())["traceEvents"]
+    assert len(events) == len(names)
+    assert all(_["ph"] == "X" and _["dur"] >= 0 for _ in events)
+
+
+def test_convert_low_memory(pdf_inputs, tmp_path):
+    """Check the images spooled to files are saved in the package"""
+    slides, _ = pdf_inputs
+    pres = beamer2pptx.convert(slides, low_memory=True)
+    spooled = [_.part.related_part(_.shapes[0]._element.blip_rId)._path
+               for _ in pres.slides]
+    assert all(pathlib.Path(_).exists() for _ in spooled)
+
+    output = tmp_path.joinpath("output.pptx")
+    pres.save(output)
+    blobs = [pathlib.Path(_).read_bytes() for _ in spooled]
+    assert [_.shapes[0].image.blob
+            for _ in pptx.Presentation(output).slides] == blobs
+
+    del pres
+    gc.collect()
+    assert not any(pathlib.Path(_).exists() for _ in spooled)
+
+
+def test_convert_searchable(pdf_inputs, tmp_path):
+    """Check the invisible text boxes laid over the slide images"""
+    slides, _ = pdf_inputs
+    pres = beamer2pptx.convert(slides, searchable=True)
+    words = next(beamer2pptx.iter_words(slides))
+    picture, *boxes = pres.slides[0].shapes
+    assert picture.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.PICTURE
+    assert " ".join(_.text_frame.text for _ in boxes) \
+        == " ".join(_.text for _ in words)
+    for box in boxes:
+        assert box.left >= 0 and box.top >= 0
+        assert box.left + box.width <= pres.slide_width
+        assert box.top + box.height <= pres.slide_height
+        assert box.text_frame.paragraphs[0].runs[0].font.fill.type \
+            == pptx.enum.dml.MSO_FILL.BACKGROUND
+
+    output = tmp_path.joinpath("output.pptx")
+    pres.save(output)
+    _, *async_boxes = asyncio.run(
+        beamer2pptx.convert_async(slides, searchable=True)
+    ).slides[0].shapes
+    assert [_.text_frame.text for _ in async_boxes] \
+        == [_.text_frame.text for _ in boxes]
+
+    pres = beamer2pptx.update(output, slides)
+    assert [len(_.shapes) for _ in pres.slides] == [1, 1, 1]
+
+
+def test_convert_links(pdf_inputs, tmp_path):
+    """Check the links of the pages are clickable on the slides"""
+    pytest.importorskip("pypdf")
+    slides, _ = pdf_inputs
+    links = beamer2pptx.extract_links(slides)
+    assert any(links)
+    pres = beamer2pptx.convert(slides, links=True)
+    for slide, page in zip(pres.slides, links):
+        _, *shapes = slide.shapes
+        assert len(shapes) == len(page)
+        for shape, link in zip(shapes, page):
+            if isinstance(link.target, int):
+                assert shape.click_action.target_slide.slide_id \
+                    == pres.slides[link.target].slide_id
+            else:
+                assert shape.click_action.hyperlink.address == link.target
+
+    output = tmp_path.joinpath("output.pptx")
+    pres.save(output)
+    pres = beamer2pptx.update(output, slides)
+    assert [len(_.shapes) for _ in pres.slides] == [1, 1, 1]
+    assert all(_.reltype == pptx.opc.constants.RELATIONSHIP_TYPE.IMAGE
+               or _.reltype.endswith("/slideLayout")
+               for slide in pres.slides for _ in slide.part.rels.values())
+
+
+def test_convert_media(media_pdf, tmp_path):
+    """Check the movies of the pages are played on the slides"""
+    slides = media_pdf
+    pres = beamer2pptx.convert(slides, dpi=72, media=True)
+    (_, movie), (_, embedded) = (_.shapes for _ in pres.slides)
+    assert movie.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.MEDIA
+    assert (movie.width, movie.height) == \
+        (pres.slide_width // 2, pres.slide_height // 2)
+    blobs = [_.target_part.blob for _ in embedded.part.rels.values()
+             if _.reltype.endswith("/media")]
+    assert blobs == [b"embedded"]
+
+    output = tmp_path.joinpath("output.pptx")
+    pres.save(output)
+    spooled = beamer2pptx.convert(slides, dpi=72, media=True,
+                                  low_memory=True)
+    assert [len(_.shapes) for _ in spooled.slides] == [2, 2]
+    spooled.save(tmp_path.joinpath("spooled.pptx"))
+
+    pres = beamer2pptx.update(output, slides, dpi=72)
+    assert [len(_.shapes) for _ in pres.slides] == [1, 1]
+    assert not any(_.reltype.endswith(("/media", "/video"))
+                   for slide in pres.slides
+                   for _ in slide.part.rels.values())
+
+
+class _Pipe:
+    """A binary stream that can only be written like a pipe"""
+
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def test_convert_to(pdf_inputs):
+    """Check writing the presentation to an unseekable stream"""
+    slides, notes = pdf_inputs
+    stream = _Pipe()
+    names = []
+    beamer2pptx.convert_to(stream, slides, notes,
+                           on_event=lambda _: names.append(_.name))
+    assert names[-2:] == ["convert", "save"]
+
+    pres = pptx.Presentation(io.BytesIO(stream.data))
+    assert len(pres.slides) == 3
+    assert pres.slides[1].notes_slide.notes_text_frame.text != ""
+
+
+def test_convert_content(pdf_inputs):
+    """Check converting PDFs given by their content"""
+    slides, notes = pdf_inputs
+    with open(slides, "rb") as stream:
+        pres = beamer2pptx.convert(stream, notes.read_bytes())
+
+    assert len(pres.slides) == 3
+    assert pres.slides[1].notes_slide.notes_text_frame.text != ""
+
+
+def test_convert_async(pdf_inputs):
+    """Check converting several presentations in one event loop"""
+    slides, notes = pdf_inputs
+    names = []
+
+    async def run():
+        limiter = asyncio.Semaphore(2)
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            return await asyncio.gather(
+                beamer2pptx.convert_async(slides, notes, limiter=limiter,
+                                          on_event=lambda _: names.append(
+                                              _.name),
+                                          executor=executor),
+                beamer2pptx.convert_async(slides.read_bytes(),
+                                          mode="vector", window=1,
+                                          limiter=limiter,
+                                          executor=executor),
+            )
+
+    raster, vector = asyncio.run(run())
+    expected = beamer2pptx.convert(slides, notes)
+    assert [_.notes_slide.notes_text_frame.text for _ in raster.slides] \
+        == [_.notes_slide.notes_text_frame.text for _ in expected.slides]
+    assert [_.shapes[0].image.blob for _ in raster.slides] \
+        == [_.shapes[0].image.blob for _ in expected.slides]
+    assert len(vector.slides) == 3
+    assert {"probe", "notes", "render", "insert", "convert"} <= set(names)
+
+
+def test_convert_page_sizes(tmp_path):
+    """Check sizing the slides from the pages and letterboxing others"""
+    pypdf = pytest.importorskip("pypdf")
+    writer = pypdf.PdfWriter()
+    writer.add_blank_page(453.543, 283.465)
+    writer.add_blank_page(283.465, 453.543)
+    slides = tmp_path.joinpath("slides.pdf")
+    writer.write(slides)
+
+    pres = beamer2pptx.convert(slides, dpi=72)
+    assert pres.slide_width / pres.slide_height == pytest.approx(1.6, 1e-4)
+    first, second = (_.shapes[0] for _ in pres.slides)
+    assert (first.left, first.top) == (0, 0)
+    assert (first.width, first.height) == \
+        (pres.slide_width, pres.slide_height)
+    assert second.top == 0 and second.height == pres.slide_height
+    assert second.left == (pres.slide_width - second.width) // 2
+    assert second.width / second.height == pytest.approx(1 / 1.6, 1e-3)
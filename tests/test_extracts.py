@@ -1,5 +1,12 @@
+import asyncio
+import concurrent.futures
+import io
+import logging
 import pathlib
 import shutil
+import subprocess
+import threading
+import time
 
 import pytest
 
@@ -25,6 +32,23 @@ def test_extract_notes(pdf_inputs, note_texts):
     assert result[1].rstrip() == "\n".join([fr"• {_}" for _ in note_texts])
 
 
+def test_iter_notes(pdf_inputs, note_texts):
+    result = list(beamer2pptx.iter_notes(pdf_inputs[1], first=2, last=2))
+    assert len(result) == 1
+    assert result[0].rstrip() == "\n".join([fr"• {_}" for _ in note_texts])
+
+    notes = beamer2pptx.iter_notes(pdf_inputs[1], layout=True)
+    assert note_texts[0] in next(notes)
+    notes.close()
+
+
+def test_iter_words(pdf_inputs, note_texts):
+    result = list(beamer2pptx.iter_words(pdf_inputs[1], last=1))
+    assert len(result) == 1
+    assert [_.text for _ in result[0]] == ". ".join(note_texts).split()
+    assert all(_.x_min < _.x_max and _.y_min < _.y_max for _ in result[0])
+
+
 def test_extract_slides(pdf_inputs, tmp_path):
     result = beamer2pptx.extract_slides(pdf_inputs[0], tmp_path)
     try:
@@ -34,3 +58,423 @@ def test_extract_slides(pdf_inputs, tmp_path):
     finally:
         for _ in result:
             pathlib.Path(_).unlink()
+
+
+def test_extract_page_count(pdf_inputs):
+    assert beamer2pptx.extract_page_count(pdf_inputs[0]) == 3
+    assert beamer2pptx.extract_page_count(pdf_inputs[1]) == 2
+
+
+@pytest.mark.parametrize("jobs", [2, 3, 8])
+def test_extract_slides_jobs(pdf_inputs, tmp_path, jobs):
+    result = beamer2pptx.extract_slides(pdf_inputs[0], tmp_path, jobs=jobs)
+    try:
+        assert len(result) == 3
+        assert result == sorted(result)
+    finally:
+        for _ in result:
+            pathlib.Path(_).unlink()
+
+
+def test_probe_pdf(pdf_inputs, aspect_ratio, title, author):
+    for pdf, pages in zip(pdf_inputs, (3, 2)):
+        info = beamer2pptx.probe_pdf(pdf)
+        assert info.pages == pages
+        assert len(info.page_sizes) == pages
+        assert info.title == title
+        assert info.author == author
+        assert beamer2pptx.extract_aspect_ratio(info) == aspect_ratio
+        assert beamer2pptx.extract_metadata(info) == \
+            beamer2pptx.extract_metadata(pdf)
+        assert beamer2pptx.extract_page_count(info) == pages
+
+
+def test_extract_slides_cache(pdf_inputs, tmp_path):
+    pytest.importorskip("pypdf")
+    cache = beamer2pptx.SlideCache(tmp_path / "cache")
+    for _ in ("first", "second"):
+        tmp_path.joinpath(_).mkdir()
+
+    first = beamer2pptx.extract_slides(pdf_inputs[0], tmp_path / "first",
+                                       cache=cache)
+    assert len(first) == 3
+    assert len(list(cache.directory.iterdir())) == 3
+
+    second = beamer2pptx.extract_slides(pdf_inputs[0], tmp_path / "second",
+                                        cache=cache)
+    assert [pathlib.Path(_).name for _ in first] == \
+        [pathlib.Path(_).name for _ in second]
+    assert all(pathlib.Path(a).read_bytes() == pathlib.Path(b).read_bytes()
+               for a, b in zip(first, second))
+
+    cache.max_size = 0
+    cache.evict()
+    assert list(cache.directory.iterdir()) == []
+
+
+def test_slide_cache_put(tmp_path):
+    """Check putting the same key from several threads at once"""
+    cache = beamer2pptx.SlideCache(tmp_path / "cache")
+    images = []
+    for index in range(8):
+        images.append(tmp_path.joinpath(f"image-{index}.png"))
+        images[-1].write_bytes(bytes([index]) * 2 ** 20)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in range(10):
+            entries = list(pool.map(cache.put, ["key"] * len(images),
+                                    images))
+
+    assert {_.name for _ in entries} == {"key.png"}
+    assert [_.name for _ in cache.directory.iterdir()] == ["key.png"]
+    data = entries[0].read_bytes()
+    assert data in {_.read_bytes() for _ in images}
+
+
+def test_slide_cache_fingerprints(pdf_inputs, tmp_path, monkeypatch):
+    """Check the fingerprints of documents sharing a cache are kept"""
+    pytest.importorskip("pypdf")
+    from beamer2pptx import _pdf
+
+    parsed = []
+    parse = _pdf.page_fingerprints
+    monkeypatch.setattr(_pdf, "page_fingerprints",
+                        lambda _: parsed.append(_) or parse(_))
+    cache = beamer2pptx.SlideCache(tmp_path / "cache")
+    for _ in range(3):
+        assert [len(cache.fingerprints(_)) for _ in pdf_inputs] == [3, 2]
+
+    assert parsed == list(pdf_inputs)
+
+
+def test_iter_slides_cache(pdf_inputs, tmp_path, monkeypatch, caplog):
+    """Check the cache is evicted and reported once per conversion"""
+    pytest.importorskip("pypdf")
+    cache = beamer2pptx.SlideCache(tmp_path / "cache")
+    evicted = []
+    monkeypatch.setattr(cache, "evict", lambda: evicted.append(True))
+    caplog.set_level(logging.INFO, logger="beamer2pptx")
+    for _ in range(2):
+        for image in beamer2pptx.iter_slides(pdf_inputs[0], tmp_path,
+                                             cache=cache, window=1):
+            pass
+
+    assert evicted == [True]
+    assert [_.getMessage() for _ in caplog.records
+            if _.getMessage().startswith("Reused")] \
+        == ["Reused 0 of 3 pages from the cache",
+            "Reused 3 of 3 pages from the cache"]
+
+
+@pytest.mark.parametrize("image_format,suffixes", [("png", {".png"}),
+                                                   ("jpeg", {".jpg"}),
+                                                   ("auto", {".png", ".jpg"}),
+                                                   ])
+def test_extract_slides_format(pdf_inputs, tmp_path, image_format, suffixes):
+    result = beamer2pptx.extract_slides(pdf_inputs[0], tmp_path, dpi=72,
+                                        image_format=image_format)
+    assert len(result) == 3
+    assert {pathlib.Path(_).suffix for _ in result} <= suffixes
+
+    with pytest.raises(ValueError):
+        beamer2pptx.extract_slides(pdf_inputs[0], tmp_path,
+                                   image_format="gif")
+
+
+def test_extract_slides_width(pdf_inputs, tmp_path):
+    from PIL import Image
+
+    result = beamer2pptx.extract_slides(pdf_inputs[0], tmp_path, width=640)
+    for _ in result:
+        with Image.open(_) as image:
+            assert image.width == 640
+
+    result = beamer2pptx.extract_slides(pdf_inputs[0], tmp_path, width=640,
+                                        height=400)
+    for _ in result:
+        with Image.open(_) as image:
+            assert image.size == (640, 400)
+
+
+def test_slide_pixels():
+    assert beamer2pptx.slide_pixels("16:9", (3840, 2160)) == (3840, 2160)
+    assert beamer2pptx.slide_pixels("4:3", (3840, 2160)) == (2880, 2160)
+    assert beamer2pptx.slide_pixels("4:3", (1024, 1024)) == (1024, 768)
+
+
+def test_extract_slides_svg(pdf_inputs, tmp_path):
+    result = beamer2pptx.extract_slides(pdf_inputs[0], tmp_path,
+                                        image_format="svg")
+    assert [pathlib.Path(_).suffix for _ in result] == [".svg"] * 3
+    assert all(b"<svg" in pathlib.Path(_).read_bytes() for _ in result)
+
+
+def test_extract_slides_range(pdf_inputs, tmp_path):
+    result = beamer2pptx.extract_slides(pdf_inputs[0], tmp_path, first=2,
+                                        last=3)
+    assert [beamer2pptx._page_number(_) for _ in result] == [2, 3]
+
+
+@pytest.mark.parametrize("window", [1, 2])
+def test_iter_slides(pdf_inputs, tmp_path, window):
+    count = 0
+    for image in beamer2pptx.iter_slides(pdf_inputs[0], tmp_path, jobs=2,
+                                         window=window):
+        assert pathlib.Path(image).exists()
+        assert len(list(tmp_path.iterdir())) <= window
+        count += 1
+
+    assert count == 3
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_iter_slides_ranges(pdf_inputs, tmp_path):
+    """Check rendering contiguous ranges with one process each"""
+    ranges = []
+    events = []
+
+    class Backend(beamer2pptx.PopplerBackend):
+        def render(self, path, output, first=None, last=None, *args):
+            ranges.append((first, last))
+            super().render(path, output, first, last, *args)
+
+    images = beamer2pptx.iter_slides(pdf_inputs[0], tmp_path, window=4,
+                                     backend=Backend(),
+                                     on_event=events.append)
+    assert [beamer2pptx._page_number(_) for _ in images] == [1, 2, 3]
+    assert ranges == [(1, 2), (3, 3)]
+    assert [_.args["page"] for _ in events] == [1, 2, 3]
+    assert events[0].end <= events[1].start <= events[1].end
+    assert not any(_.args["cached"] for _ in events)
+
+    images = beamer2pptx.iter_slides(pdf_inputs[0], tmp_path, window=4)
+    next(images)
+    images.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_extract_page_labels(pdf_inputs):
+    pytest.importorskip("pypdf")
+    assert beamer2pptx.extract_page_labels(pdf_inputs[0]) == ["1", "2", "3"]
+
+
+def test_extract_links(tmp_path):
+    pypdf = pytest.importorskip("pypdf")
+    from pypdf.annotations import Link
+    from pypdf.generic import DictionaryObject, NameObject, TextStringObject
+
+    writer = pypdf.PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(400, 300)
+
+    writer.add_named_destination("Navigation3", 2)
+    writer.add_annotation(0, Link(rect=(10, 20, 30, 40),
+                                  target_page_index=1))
+    writer.add_uri(0, "https://example.com/", (50, 60, 70, 80))
+    for rect, action in [
+        ((1, 1, 5, 5), {"/S": NameObject("/GoTo"),
+                        "/D": TextStringObject("Navigation3")}),
+        ((5, 1, 9, 5), {"/S": NameObject("/Named"),
+                        "/N": NameObject("/PrevPage")}),
+        ((9, 1, 13, 5), {"/S": NameObject("/Named"),
+                         "/N": NameObject("/NextPage")}),
+    ]:
+        annotation = Link(rect=rect, url="")
+        annotation[NameObject("/A")] = DictionaryObject(
+            {NameObject(key): value for key, value in action.items()}
+        )
+        writer.add_annotation(1, annotation)
+
+    path = tmp_path.joinpath("links.pdf")
+    writer.write(path)
+    first, second, third = beamer2pptx.extract_links(path)
+    assert first == [(1, 10, 260, 30, 280),
+                     ("https://example.com/", 50, 220, 70, 240)]
+    assert [_.target for _ in second] == [2, 0, 2]
+    assert third == []
+
+
+def test_extract_media(media_pdf, tmp_path, caplog):
+    path = media_pdf
+    output = tmp_path.joinpath("output")
+    output.mkdir()
+    with caplog.at_level(logging.WARNING):
+        first, second = beamer2pptx.extract_media(path, output)
+
+    assert first == [(str(tmp_path.joinpath("clip.mp4")), 100, 50, 300, 200)]
+    assert "missing.mp4" in caplog.text
+    (media, *box), = second
+    assert box == [50, 140, 150, 240]
+    assert pathlib.Path(media).parent == output
+    assert pathlib.Path(media).suffix == ".webm"
+    assert pathlib.Path(media).read_bytes() == b"embedded"
+
+
+def test_extract_media_outside(media_pdf, tmp_path, caplog):
+    pypdf = pytest.importorskip("pypdf")
+    from pypdf.generic import (
+        ArrayObject,
+        DictionaryObject,
+        FloatObject,
+        NameObject,
+        TextStringObject,
+    )
+
+    deck = tmp_path.joinpath("deck")
+    deck.mkdir()
+    tmp_path.joinpath("secret.mp4").write_bytes(b"secret")
+    deck.joinpath("clip.mp4").write_bytes(b"referenced")
+    writer = pypdf.PdfWriter()
+    writer.add_blank_page(400, 300)
+    for name in ["/etc/passwd", str(tmp_path.joinpath("secret.mp4")),
+                 "../secret.mp4", "clip.mp4"]:
+        writer.add_annotation(0, DictionaryObject({
+            NameObject("/Type"): NameObject("/Annot"),
+            NameObject("/Subtype"): NameObject("/Movie"),
+            NameObject("/Rect"): ArrayObject(FloatObject(_)
+                                             for _ in (0, 0, 10, 10)),
+            NameObject("/Movie"): DictionaryObject({
+                NameObject("/F"): TextStringObject(name),
+            }),
+        }))
+
+    path = deck.joinpath("deck.pdf")
+    writer.write(path)
+    with caplog.at_level(logging.WARNING):
+        media, = beamer2pptx.extract_media(path, tmp_path)
+
+    assert [_.path for _ in media] == [str(deck.joinpath("clip.mp4"))]
+    assert "outside" in caplog.text
+
+    media, = beamer2pptx.extract_media(path.read_bytes(), tmp_path)
+    assert media == []
+    media = beamer2pptx.extract_media(media_pdf.read_bytes(), tmp_path)
+    assert [len(_) for _ in media] == [0, 1]
+
+
+def test_pdfium_backend(pdf_inputs, tmp_path, note_texts):
+    pytest.importorskip("pypdfium2")
+    with beamer2pptx.PdfiumBackend() as backend:
+        for pdf in pdf_inputs:
+            info = beamer2pptx.probe_pdf(pdf, backend=backend)
+            expected = beamer2pptx.probe_pdf(pdf)
+            assert info[:5] == expected[:5]
+            assert beamer2pptx.extract_aspect_ratio(info) == \
+                beamer2pptx.extract_aspect_ratio(expected)
+
+        result = beamer2pptx.extract_notes(pdf_inputs[1], backend=backend)
+        assert len(result) == 2
+        assert result[0].rstrip() == ". ".join(note_texts)
+
+        result = beamer2pptx.extract_slides(pdf_inputs[0], tmp_path, jobs=2,
+                                            width=640, backend=backend)
+        assert [beamer2pptx._page_number(_) for _ in result] == [1, 2, 3]
+
+        with pytest.raises(NotImplementedError):
+            beamer2pptx.extract_slides(pdf_inputs[0], tmp_path,
+                                       image_format="svg", backend=backend)
+
+        content = pdf_inputs[0].read_bytes()
+        for _ in range(2):
+            beamer2pptx.probe_pdf(content, backend=backend)
+
+        assert len(backend._documents) == len(pdf_inputs) + 1
+
+    with pytest.raises(ValueError):
+        beamer2pptx.probe_pdf(pdf_inputs[0], backend="ghostscript")
+
+
+def test_pdf_content(pdf_inputs, tmp_path, note_texts):
+    slides, notes = pdf_inputs
+    content = slides.read_bytes()
+    for pdf in (content, memoryview(content), io.BytesIO(content)):
+        assert beamer2pptx.probe_pdf(pdf) == beamer2pptx.probe_pdf(slides)
+
+    result = beamer2pptx.extract_notes(io.BytesIO(notes.read_bytes()))
+    assert result == beamer2pptx.extract_notes(notes)
+
+    result = beamer2pptx.extract_slides(content, tmp_path, jobs=2)
+    assert [pathlib.Path(_).parent for _ in result] == [tmp_path] * 3
+    assert list(tmp_path.glob("*.pdf")) == []
+
+
+def test_extract_async(pdf_inputs, tmp_path, note_texts):
+    slides, notes = pdf_inputs
+
+    async def extract():
+        limiter = asyncio.Semaphore(2)
+        return await asyncio.gather(
+            beamer2pptx.probe_pdf_async(slides, limiter=limiter),
+            beamer2pptx.extract_notes_async(notes, limiter=limiter),
+            beamer2pptx.extract_slides_async(slides, tmp_path, jobs=2,
+                                             limiter=limiter),
+        )
+
+    info, text, images = asyncio.run(extract())
+    assert info == beamer2pptx.probe_pdf(slides)
+    assert text == beamer2pptx.extract_notes(notes)
+    assert [beamer2pptx._page_number(_) for _ in images] == [1, 2, 3]
+
+
+def test_run_async_timeout():
+    logger = logging.getLogger(__name__)
+    start = time.time()
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(beamer2pptx._run_async(["sleep", "10"], 0.1, logger))
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(
+            beamer2pptx._run_async(["sleep", "10"], None, logger), 0.1
+        ))
+
+    assert time.time() - start < 5
+
+
+def test_loop_runner():
+    """Check the steps of a conversion run in an event loop"""
+    logger = logging.getLogger(__name__)
+    threads = []
+
+    async def sleep():
+        await beamer2pptx._run_async(["sleep", "10"], None, logger)
+
+    async def run():
+        with concurrent.futures.ThreadPoolExecutor(
+                1, thread_name_prefix="steps") as executor:
+            runner = beamer2pptx._LoopRunner(asyncio.Semaphore(2), executor)
+            await runner.call(
+                lambda: threads.append(threading.current_thread().name)
+            )
+            await asyncio.wait_for(runner.gather([sleep, sleep], 2), 0.1)
+
+    start = time.time()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run())
+
+    assert time.time() - start < 5
+    assert threads[0].startswith("steps")
+    with pytest.raises(RuntimeError):
+        beamer2pptx._drive(asyncio.sleep(0))
+
+
+def test_slide_size():
+    def info(*sizes):
+        return beamer2pptx.PdfInfo("", "", "", "", len(sizes), list(sizes))
+
+    assert beamer2pptx.slide_size(info((362.835, 272.126))) == \
+        beamer2pptx.ASPECT_RATIOS["4:3"]
+
+    wide = info((453.543, 283.465))
+    assert beamer2pptx.extract_aspect_ratio(wide) == "8:5"
+    width, height = beamer2pptx.slide_size(wide)
+    assert height == beamer2pptx.ASPECT_RATIOS["16:9"][1]
+    assert width / height == pytest.approx(1.6, 1e-4)
+    assert beamer2pptx.slide_pixels((width, height), (1920, 1080)) == \
+        (1728, 1080)
+
+    width, height = beamer2pptx.slide_size(info((7200, 72)))
+    assert width == beamer2pptx._MAX_SLIDE_SIZE
+    assert width / height == pytest.approx(100, abs=1e-3)
+
+    with pytest.raises(RuntimeError):
+        beamer2pptx.extract_aspect_ratio(info())
@@ -0,0 +1,97 @@
+import io
+import json
+import shutil
+
+import pptx
+import pytest
+
+from beamer2pptx._main import _main, _read_map
+
+
+def test_main_batch(pdf_inputs, tmp_path, capsys):
+    """Check converting several presentations in one run"""
+    slides, notes = pdf_inputs
+    copy = tmp_path.joinpath("copy.pdf")
+    shutil.copyfile(slides, copy)
+    broken = tmp_path.joinpath("broken.pdf")
+    broken.write_text("not a PDF")
+    mapping = tmp_path.joinpath("map.txt")
+    mapping.write_text("2\n1\n")
+    manifest = tmp_path.joinpath("manifest.csv")
+    manifest.write_text(f"{slides},{notes},{mapping}\n"
+                        "# A comment\n"
+                        f"{broken.name}\n")
+
+    output = tmp_path.joinpath("output")
+    with pytest.raises(SystemExit) as err:
+        _main([str(copy), "--manifest", str(manifest), "--output",
+               str(output), "--decks", "2", "--jobs", "2"])
+
+    assert "1 of 3" in str(err.value)
+    result = capsys.readouterr().out
+    assert f"failed: {broken}" in result
+    assert result.count("ok: ") == 2
+
+    pres = pptx.Presentation(output.joinpath(slides.stem + ".pptx"))
+    assert len(pres.slides) == 3
+    assert pres.slides[1].notes_slide.notes_text_frame.text != ""
+    assert len(pptx.Presentation(output.joinpath("copy.pptx")).slides) == 3
+
+
+def test_main_single_options(pdf_inputs, tmp_path):
+    """Check notes and mappings are limited to a single presentation"""
+    slides, notes = pdf_inputs
+    with pytest.raises(SystemExit):
+        _main([str(slides), str(slides), "--notes", str(notes)])
+
+
+def test_read_map(tmp_path):
+    """Check reading slide numbers and page labels from a mapping"""
+    mapping = tmp_path.joinpath("map.txt")
+    mapping.write_text("2\nlabel: A-1\n0\n")
+    assert _read_map(str(mapping)) == [2, "A-1", 0]
+
+    mapping.write_text("two\n")
+    with pytest.raises(ValueError):
+        _read_map(str(mapping))
+
+
+def test_main_profile(pdf_inputs, tmp_path, capsys):
+    """Check writing the trace of the conversion stages"""
+    slides, _ = pdf_inputs
+    profile = tmp_path.joinpath("trace.json")
+    _main([str(slides), "--output", str(tmp_path.joinpath("out.pptx")),
+           "--profile", str(profile)])
+    events = json.loads(profile.read_text())["traceEvents"]
+    assert {"convert", "render", "save"} <= {_["name"] for _ in events}
+    assert "save:" in capsys.readouterr().err
+
+
+def test_main_stdout(pdf_inputs, tmp_path, monkeypatch, capsysbinary):
+    """Check writing the presentation to the standard output"""
+    slides, _ = pdf_inputs
+    monkeypatch.chdir(tmp_path)
+    _main([str(slides), "--output", "-"])
+    pres = pptx.Presentation(io.BytesIO(capsysbinary.readouterr().out))
+    assert len(pres.slides) == 3
+    assert not tmp_path.joinpath("-").exists()
+
+    with pytest.raises(SystemExit):
+        _main([str(slides), str(slides), "--output", "-"])
+
+
+def test_main_stdin(pdf_inputs, tmp_path, monkeypatch, capsysbinary):
+    """Check reading the presentation from the standard input"""
+    slides, notes = pdf_inputs
+    stdin = io.TextIOWrapper(io.BytesIO(slides.read_bytes()))
+    monkeypatch.setattr("sys.stdin", stdin)
+    _main(["-", "--notes", str(notes)])
+    pres = pptx.Presentation(io.BytesIO(capsysbinary.readouterr().out))
+    assert len(pres.slides) == 3
+    assert pres.slides[1].notes_slide.notes_text_frame.text != ""
+
+    with pytest.raises(SystemExit):
+        _main(["-", "--notes", "-"])
+
+    with pytest.raises(SystemExit):
+        _main([str(tmp_path.joinpath("missing.pdf"))])